@@ -10,6 +10,7 @@ from codex.admin.users import CustomUserAdmin
 
 from codex.models.events import Game, DMReward, Trade
 from codex.models.trade import Advert, Offer
+from codex.models.imports import ImportJob
 
 
 admin.site.register(CodexUser, CustomUserAdmin)
@@ -28,3 +29,5 @@ admin.site.register(Trade)
 
 admin.site.register(Advert)
 admin.site.register(Offer)
+
+admin.site.register(ImportJob)
@@ -1,20 +1,24 @@
+from typing import List
+
+
 class ALLGameEvent:
     """and adventurers league log (ALL) game event"""
 
-    event_type = ""
-    adventure_title = ""
-    date_played = ""
-    session_length_hours = ""
-    levels_gained = ""
-    gp_gained = ""
-    downtime_gained = ""
-    location_played = ""
-    dm_name = ""
-    notes = ""
-    date_dmed = ""
-
-    def __init__(self, data):
-        fields = data.split(",")
+    __slots__ = (
+        "event_type",
+        "adventure_title",
+        "date_played",
+        "session_length_hours",
+        "levels_gained",
+        "gp_gained",
+        "downtime_gained",
+        "location_played",
+        "dm_name",
+        "notes",
+        "date_dmed",
+    )
+
+    def __init__(self, fields: List[str]):
         if fields[0] != "CharacterLogEntry":
             raise ValueError("Not a CharacterLogEntry")
 
@@ -32,14 +36,9 @@ class ALLGameEvent:
 
 
 class ALLItemEvent:
-    event_type = ""
-    name = ""
-    rarity = ""
-    notes = ""
-    associated_event = None
-
-    def __init__(self, data):
-        fields = data.split(",")
+    __slots__ = ("event_type", "name", "rarity", "notes", "associated_event")
+
+    def __init__(self, fields: List[str]):
         if fields[0] != "MAGIC ITEM":
             raise ValueError("Not a magic item")
         if fields[1] == "name":
@@ -49,23 +48,29 @@ class ALLItemEvent:
         self.name = fields[1]
         self.rarity = fields[2]
         self.notes = fields[6]
+        self.associated_event = None
 
         if not self.name:
             raise ValueError("Item has no name")
 
 
 class ALLItemTradeEvent:
-    event_type = ""
-    name = ""
-    rarity = ""
-    notes = ""
-    associated_event = None
-
-    def __init__(self, data):
-        fields = data.split(",")
+    __slots__ = ("event_type", "name", "rarity", "notes", "associated_event")
+
+    def __init__(self, fields: List[str]):
         if fields[0] != "TRADED MAGIC ITEM":
             raise ValueError("Not a magic item trade")
 
         self.event_type = fields[0]
         self.name = fields[1]
         self.rarity = fields[2]
+        self.notes = ""
+        self.associated_event = None
+
+
+# Map the first column of an ALL export row to the event class that parses it
+EVENT_TYPES = {
+    "CharacterLogEntry": ALLGameEvent,
+    "MAGIC ITEM": ALLItemEvent,
+    "TRADED MAGIC ITEM": ALLItemTradeEvent,
+}
@@ -1,6 +1,10 @@
-from typing import List
+import csv
+from typing import Callable, Iterable, List
+
+from django.db import transaction
 
 from codex.models.character import Character
+from codex.utils.character import update_character_counters
 
 from codex.imports.adventurersleaguelogs import ALLGameEvent
 from codex.imports.parse_classes import parse_classes
@@ -28,7 +32,7 @@ def get_level_up_events(events: List[ALLGameEvent]):
 
 def create_character_from_csv_data(char_data, event_data, user):
     """convert raw data to a new character object"""
-    [name, race, char_class, _faction, _background, _lifestyle, artwork_url, public] = char_data.split(",")
+    [name, race, char_class, _faction, _background, _lifestyle, artwork_url, public] = char_data
     levels = get_level_up_events(event_data)
     classes = parse_classes(char_class)
 
@@ -39,35 +43,54 @@ def create_character_from_csv_data(char_data, event_data, user):
     return character
 
 
-def parse_csv_import(csv_data, user):
+def parse_csv_import(csv_data: Iterable[str], user, progress: Callable | None = None):
+    """Create a character from an Adventurers League Logs export, read line by line from any iterable
+
+    If given, progress is called with the number of events once parsed, then the number of games and items created
+    """
+    rows = csv.reader(csv_data)
+
     # split the file into expected parts
     try:
-        char_header = csv_data[0]
-        char_data = csv_data[1]
-        event_header = csv_data[2]
-        event_data = csv_data[3:]
-    except IndexError as _e:
+        char_header = next(rows)
+        char_data = next(rows)
+        event_header = next(rows)
+    except StopIteration as _e:
         raise Exception("File does not appear to be a valid Adventurers League Logs export")
 
-    if char_header != expected_character_header or event_header != expected_event_header:
+    if ",".join(char_header) != expected_character_header or ",".join(event_header) != expected_event_header:
         raise Exception("File does not appear to be a valid Adventurers League Logs export")
 
-    events = parse_events(event_data)
-    character = create_character_from_csv_data(char_data, events, user)
-
-    # Handle item logic
-    try:
-        gained_items = get_magic_items_from_events(events)
-        lost_items = get_traded_items_from_events(events)
-        current_items = remove_traded_items(gained_items, lost_items)
-        msc_items = create_msc_items(current_items, character)
-    except Exception as e:
-        print(f"[!] Error parsing items: {e}")
-
-    try:
-        games = get_games_from_events(events)
-        msc_games = create_msc_games(games, character, user)
-    except Exception as e:
-        print(f"[!] Error parsing games: {e}")
-
+    events = parse_events(rows)
+    msc_items = []
+    msc_games = []
+    if progress:
+        progress(events_parsed=len(events))
+
+    with transaction.atomic():
+        character = create_character_from_csv_data(char_data, events, user)
+
+        # Handle item logic
+        try:
+            with transaction.atomic():
+                gained_items = get_magic_items_from_events(events)
+                lost_items = get_traded_items_from_events(events)
+                current_items = remove_traded_items(gained_items, lost_items)
+                msc_items = create_msc_items(current_items, character)
+        except Exception as e:
+            print(f"[!] Error parsing items: {e}")
+
+        try:
+            with transaction.atomic():
+                games = get_games_from_events(events)
+                msc_games = create_msc_games(games, character, user)
+        except Exception as e:
+            print(f"[!] Error parsing games: {e}")
+
+        # bulk creation bypasses the signals that maintain the counters
+        update_character_counters(character.pk)
+        character.refresh_from_db()
+
+    if progress:
+        progress(games_created=len(msc_games), items_created=len(msc_items))
     return character
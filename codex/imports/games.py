@@ -1,8 +1,12 @@
 import re
-import dateparser
+from datetime import datetime, timezone
+from functools import lru_cache
 
 from codex.models.events import Game
 
+# Formats used by Adventurers League Logs exports, tried before falling back to dateparser
+ALL_DATE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"]
+
 
 def get_code_and_name(data):
     code = None
@@ -17,19 +21,42 @@ def get_code_and_name(data):
     return (code, name)
 
 
+@lru_cache(maxsize=4096)
+def parse_game_date(data: str) -> datetime | None:
+    """Convert an ALL date string to a datetime, trying the known export formats before dateparser"""
+    data = (data or "").strip()
+    if not data:
+        return None
+
+    tz = None
+    if data.endswith(" UTC"):
+        data = data[:-4]
+        tz = timezone.utc
+    for date_format in ALL_DATE_FORMATS:
+        try:
+            return datetime.strptime(data, date_format).replace(tzinfo=tz)
+        except ValueError:
+            continue
+
+    # dateparser is slow to import and to run, so only pay for it when the string is in an unexpected format
+    import dateparser
+
+    return dateparser.parse(data if not tz else f"{data} UTC")
+
+
 def create_msc_games(games, character, user):
-    """for each game create an entry in MSC"""
+    """for each game create an entry in MSC, games and their character links are each written in one query"""
     created = []
 
     for game in games:
         try:
             (code, name) = get_code_and_name(game.adventure_title)
 
-            msc_game = Game.objects.create(
+            msc_game = Game(
                 module=code or "?",
                 owner=user,
                 name=name,
-                datetime=dateparser.parse(game.date_played),
+                datetime=parse_game_date(game.date_played),
                 hours=int(game.session_length_hours or 0),
                 levels=1,
                 downtime=int(float(game.downtime_gained or 0)),
@@ -38,11 +65,12 @@ def create_msc_games(games, character, user):
                 dm_name=game.dm_name,
                 location=game.location_played,
             )
-            msc_game.characters.set([character])
-            msc_game.save()
-
             created.append(msc_game)
         except Exception as e:
             print(e)
             continue
+
+    created = Game.objects.bulk_create(created)
+    links = [Game.characters.through(game_id=game.pk, character_id=character.pk) for game in created]
+    Game.characters.through.objects.bulk_create(links)
     return created
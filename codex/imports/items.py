@@ -1,49 +1,100 @@
+import hashlib
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.db.models.functions import Upper
+
 from codex.models.items import MagicItem
 
+# Details of the oldest item with each name are kept in the shared cache, so every server process and the import
+# worker see the same ones, and edits made anywhere are picked up within the timeout at most
+CANONICAL_ITEM_CACHE_TTL = 600
+
+
+def get_canonical_item_cache_key(name: str) -> str:
+    """Name the details for an item name are stored under in the shared cache, hashed to keep it a safe length"""
+    return f"codex:canonical_item:{hashlib.md5(name.upper().encode()).hexdigest()}"
+
+
+def forget_canonical_item(name: str) -> None:
+    """Read the details for an item name from the database again, called whenever a magic item is changed or removed"""
+    if name:
+        cache.delete(get_canonical_item_cache_key(name))
+
 
 def remove_traded_items(items, traded):
-    for traded_item in traded:
-        for item in items:
-            if traded_item.name == item.name and traded_item.rarity == item.rarity:
-                items.remove(item)
-                break
-    return items
+    """Remove the earliest gained item matching the name and rarity of each traded item"""
+    to_remove = Counter((traded_item.name, traded_item.rarity) for traded_item in traded)
+
+    remaining = []
+    for item in items:
+        key = (item.name, item.rarity)
+        if to_remove[key]:
+            to_remove[key] -= 1
+            continue
+        remaining.append(item)
+    return remaining
+
+
+def get_canonical_items(names) -> dict:
+    """Find existing details for each item name, names that aren't cached are resolved in a single pass
+
+    Only names that were found are cached, so a name seen before any item had it is looked up again next time
+    """
+    keys = {name.upper() for name in names if name}
+    cache_keys = {key: get_canonical_item_cache_key(key) for key in keys}
+    cached = cache.get_many(cache_keys.values())
+    results = {key: cached.get(cache_key) for key, cache_key in cache_keys.items()}
+
+    missing = [key for key, details in results.items() if details is None]
+    if missing:
+        # match case insensitively so the lookup can use item_name_upper_idx
+        first_items = (
+            MagicItem.objects.annotate(name_upper=Upper("name"))
+            .filter(name_upper__in=missing)
+            .values("name_upper")
+            .annotate(first=Min("pk"))
+            .values("first")
+        )
+        found = {
+            item["name_upper"]: item
+            for item in MagicItem.objects.filter(pk__in=first_items)
+            .annotate(name_upper=Upper("name"))
+            .values("name_upper", "attunement", "description", "rarity")
+        }
+        cache.set_many({cache_keys[key]: item for key, item in found.items()}, CANONICAL_ITEM_CACHE_TTL)
+        results.update(found)
+    return results
 
 
 def create_msc_items(items, character):
-    """for each item create an entry in MSC"""
+    """for each item create an entry in MSC, the new items are written in one query"""
     created = []
+    existing_items = get_canonical_items([item.name for item in items])
 
     for item in items:
         attunement = False
         description = ""
         rarity = item.rarity or "common"
 
-        try:
-            existing_item = MagicItem.objects.filter(name=item.name).first()
-            if existing_item:
-                attunement = existing_item.attunement
-                description = existing_item.description
-
-                # double check item rarities for items marked as common
-                if rarity == "common" and existing_item.rarity:
-                    rarity = existing_item.rarity
+        existing_item = existing_items.get(item.name.upper())
+        if existing_item:
+            attunement = existing_item["attunement"]
+            description = existing_item["description"]
 
-        except MagicItem.DoesNotExist:
-            pass
-        except Exception as e:
-            print(e)
+            # double check item rarities for items marked as common
+            if rarity == "common" and existing_item["rarity"]:
+                rarity = existing_item["rarity"]
 
-        try:
-            msc_item = MagicItem.objects.create(
+        created.append(
+            MagicItem(
                 character=character,
                 name=item.name,
                 rarity=rarity,
                 attunement=attunement,
                 description=description,
             )
-            created.append(msc_item)
-        except Exception as e:
-            print(e)
+        )
 
-    return created
+    return MagicItem.objects.bulk_create(created)
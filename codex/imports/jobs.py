@@ -0,0 +1,49 @@
+import io
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from codex.models.imports import ImportJob
+from codex.imports.csv import parse_csv_import
+
+IMPORT_JOB_TIMEOUT = timedelta(minutes=30)
+
+
+def claim_import_job(timeout: timedelta = IMPORT_JOB_TIMEOUT) -> ImportJob | None:
+    """Take the oldest pending job off the queue, the status update ensures only one worker can claim each job
+
+    Jobs left running for longer than the timeout belonged to a worker that died, so they are claimed again. Imports
+    run in a transaction, so an interrupted job has left nothing behind
+    """
+    stale = timezone.now() - timeout
+    claimable = Q(status=ImportJob.Status.PENDING) | Q(status=ImportJob.Status.RUNNING, started__lt=stale)
+    pending = ImportJob.objects.filter(claimable).order_by("created", "pk")
+    for pk in pending.values_list("pk", flat=True)[:10]:
+        claimed = ImportJob.objects.filter(claimable, pk=pk).update(
+            status=ImportJob.Status.RUNNING, started=timezone.now()
+        )
+        if claimed:
+            return ImportJob.objects.select_related("user").get(pk=pk)
+    return None
+
+
+def run_import_job(job: ImportJob) -> ImportJob:
+    """Import the character held by a job, recording progress and the outcome on the job"""
+
+    def progress(**counts):
+        ImportJob.objects.filter(pk=job.pk).update(**counts)
+        for name, value in counts.items():
+            setattr(job, name, value)
+
+    try:
+        job.character = parse_csv_import(io.StringIO(job.data), job.user, progress=progress)
+        job.status = ImportJob.Status.COMPLETE
+        job.data = ""
+    except Exception as e:
+        job.status = ImportJob.Status.FAILED
+        job.message = f"Character import failed {str(e)}"
+
+    job.finished = timezone.now()
+    job.save()
+    return job
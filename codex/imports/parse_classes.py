@@ -1,44 +1,54 @@
 import re
+from functools import lru_cache
+
+CLASS_NAMES = [
+    "artificer",
+    "barbarian",
+    "bard",
+    "cleric",
+    "druid",
+    "fighter",
+    "monk",
+    "paladin",
+    "ranger",
+    "rogue",
+    "sorcerer",
+    "warlock",
+    "wizard",
+]
+
+# longest names first so that barbarian is preferred to bard
+re_token = re.compile(
+    r"(?P<name>{})|(?P<level>\d+)|(?P<subclass>[^\W\d]+)".format("|".join(sorted(CLASS_NAMES, key=len, reverse=True))),
+    re.IGNORECASE,
+)
+re_separator = re.compile(r"[,;/\\]")
 
 
 def parse_class(data: str):
-    c = {"name": "", "subclass": "", "value": 1}
+    """Identify a class, level and subclass from a single class description such as 'Wizard (Abjuration) 10'"""
+    name = ""
+    level = None
+    subclass = []
 
-    re_class = r"(wizard)|(fighter)|(rogue)|(artificer)|(barbarian)(bard)|(cleric)|(druid)|(monk)|(paladin)|(ranger)|(sorcerer)|(warlock)"
-    re_level = r"\d+"
-    re_subclass = r"(\w+)"
+    # the first class name and number found are used, any other words make up the subclass
+    for token in re_token.finditer(data):
+        if token.lastgroup == "name" and not name:
+            name = token.group().title()
+        elif token.lastgroup == "level" and level is None:
+            level = int(token.group())
+        else:
+            subclass.append(token.group())
 
-    # find and remove class names
-    match = re.search(re_class, data, re.IGNORECASE)
-    if match:
-        name = match.group(0)
-        data = data.replace(name, "")
-        c["name"] = name.title()
+    return {"name": name, "subclass": " ".join(subclass).title(), "value": 1 if level is None else level}
 
-    # find and remove numbers
-    match = re.search(re_level, data)
-    if match:
-        level = match.group(0)
-        data = data.replace(level, "")
-        c["value"] = int(level or 1)
 
-    # whatever is left (excluding special chars) must be the subclass
-    data = data.strip()
-    matches = re.findall(re_subclass, data)
-    if matches:
-        subclass = " ".join(matches)
-        c["subclass"] = subclass.strip().title()
-
-    return c
+@lru_cache(maxsize=1024)
+def parse_classes_cached(data: str):
+    """Parsed classes as immutable tuples, so that cached results can't be changed by callers"""
+    return tuple(tuple(parse_class(c).items()) for c in re_separator.split(data))
 
 
 def parse_classes(data: str):
     """Attempt to identify a character's classes, subclasses and levels from a string"""
-    data = data.translate(str.maketrans({",": ";", ",": ";", "/": ";", "\\": ";"}))
-    classes = data.split(";")
-
-    results = []
-    for c in classes:
-        parsed = parse_class(c)
-        results.append(parsed)
-    return results
+    return [dict(c) for c in parse_classes_cached(data)]
@@ -1,26 +1,21 @@
-from codex.imports.adventurersleaguelogs import ALLGameEvent, ALLItemEvent, ALLItemTradeEvent
+from typing import Iterable, List
 
+from codex.imports.adventurersleaguelogs import EVENT_TYPES
 
-def parse_events(event_data):
-    events = []
-
-    for raw_event in event_data:
-        try:
-            event_type = raw_event.split(",")[0]
-            event = None
-
-            if event_type == "CharacterLogEntry":
-                event = ALLGameEvent(raw_event)
 
-            if event_type == "MAGIC ITEM":
-                event = ALLItemEvent(raw_event)
-                # Magic items are listed directly under the game or event that generated them
+def parse_events(event_rows: Iterable[List[str]]) -> List:
+    """Create events from the rows of an ALL export as produced by csv.reader, unknown rows are skipped"""
+    events = []
 
-            if event_type == "TRADED MAGIC ITEM":
-                event = ALLItemTradeEvent(raw_event)
+    for fields in event_rows:
+        if not fields:
+            continue
 
-            if event:
-                events.append(event)
-        except Exception as e:
+        event_class = EVENT_TYPES.get(fields[0])
+        if not event_class:
+            continue
+        try:
+            events.append(event_class(fields))
+        except (ValueError, IndexError):
             continue
     return events
@@ -0,0 +1,65 @@
+import io
+import zipfile
+
+# Largest file accepted in an upload, and largest export that is read from one, in bytes
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+MAX_EXPORT_SIZE = 5 * 1024 * 1024
+
+
+class ExportFileError(ValueError):
+    """An uploaded file that can't be read as character exports"""
+
+    def __init__(self, filename, message):
+        self.filename = filename
+        super().__init__(f"{filename} {message}")
+
+
+def get_archive_members(upload, archive):
+    """The CSV files within a zip archive, checking their sizes before any of them are read"""
+    try:
+        members = [m for m in archive.infolist() if not m.is_dir() and m.filename.lower().endswith(".csv")]
+    except zipfile.BadZipFile as e:
+        raise ExportFileError(upload.name, "is not a valid zip archive") from e
+    for member in members:
+        if member.file_size > MAX_EXPORT_SIZE:
+            raise ExportFileError(f"{upload.name}/{member.filename}", f"is larger than {MAX_EXPORT_SIZE} bytes")
+    return members
+
+
+def check_export_files(uploads):
+    """Check the size of every upload and the directory of every archive, raising ExportFileError for any problem"""
+    for upload in uploads:
+        if upload.size > MAX_UPLOAD_SIZE:
+            raise ExportFileError(upload.name, f"is larger than {MAX_UPLOAD_SIZE} bytes")
+        if zipfile.is_zipfile(upload):
+            upload.seek(0)
+            try:
+                with zipfile.ZipFile(upload) as archive:
+                    get_archive_members(upload, archive)
+            except zipfile.BadZipFile as e:
+                raise ExportFileError(upload.name, "is not a valid zip archive") from e
+        elif upload.size > MAX_EXPORT_SIZE:
+            raise ExportFileError(upload.name, f"is larger than {MAX_EXPORT_SIZE} bytes")
+
+
+def get_export_files(uploads):
+    """Yield (name, text stream) for each uploaded export, zip archives are expanded into their CSV files
+
+    Every upload is checked before the first export is yielded, so an ExportFileError is raised before any of them
+    have been imported
+    """
+    check_export_files(uploads)
+    for upload in uploads:
+        if zipfile.is_zipfile(upload):
+            upload.seek(0)
+            with zipfile.ZipFile(upload) as archive:
+                for member in get_archive_members(upload, archive):
+                    try:
+                        export = archive.open(member)
+                    except (zipfile.BadZipFile, NotImplementedError) as e:
+                        raise ExportFileError(f"{upload.name}/{member.filename}", "can't be read") from e
+                    with export:
+                        yield member.filename, io.TextIOWrapper(export, encoding="utf-8-sig")
+        else:
+            upload.seek(0)
+            yield upload.name, io.TextIOWrapper(upload.file, encoding="utf-8-sig")
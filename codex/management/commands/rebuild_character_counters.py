@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from codex.models.character import Character
+from codex.utils.character import get_counter_expressions, update_character_counters
+
+COUNTERS = ["item_count", "game_count", "event_count"]
+
+
+class Command(BaseCommand):
+    help = "Recalculate the denormalised item, game and event counts held on each character"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify", action="store_true", help="Report characters with incorrect counts without changing them"
+        )
+
+    def get_mismatches(self):
+        """Find characters whose stored counters differ from the real counts"""
+        expected = {f"expected_{name}": expression for name, expression in get_counter_expressions().items()}
+        characters = Character.objects.annotate(**expected).values("pk", "name", *COUNTERS, *expected)
+
+        mismatches = []
+        for character in characters.iterator():
+            wrong = [name for name in COUNTERS if character[name] != character[f"expected_{name}"]]
+            if wrong:
+                mismatches.append((character, wrong))
+        return mismatches
+
+    def handle(self, *args, **options):
+        mismatches = self.get_mismatches()
+        for character, wrong in mismatches:
+            details = ", ".join(f"{name} {character[name]} != {character[f'expected_{name}']}" for name in wrong)
+            self.stdout.write(f"{character['name']} ({character['pk']}): {details}")
+
+        if options["verify"]:
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} characters have incorrect counters")
+            self.stdout.write(self.style.SUCCESS("All character counters are correct"))
+            return
+
+        update_character_counters(*[character["pk"] for character, _ in mismatches])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {len(mismatches)} characters"))
@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from codex.models.imports import ImportJob
+from codex.imports.jobs import IMPORT_JOB_TIMEOUT, claim_import_job, run_import_job
+
+
+class Command(BaseCommand):
+    help = "Process queued character imports, polling the database for new jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty instead of waiting")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to wait between polls of the queue")
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=IMPORT_JOB_TIMEOUT.total_seconds() / 60,
+            help="Minutes after which a running job is assumed to be abandoned and is claimed again",
+        )
+
+    def handle(self, *args, **options):
+        timeout = timedelta(minutes=options["timeout"])
+        while True:
+            # The worker runs outside the request cycle, so it has to drop broken or expired connections itself.
+            # A connection inside a transaction (as when called from tests) belongs to the caller and is left alone
+            if not connection.in_atomic_block:
+                close_old_connections()
+            job = claim_import_job(timeout)
+            if not job:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            job = run_import_job(job)
+            if job.status == ImportJob.Status.COMPLETE:
+                self.stdout.write(self.style.SUCCESS(f"Imported {job.character.name} for {job.user} ({job.uuid})"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{job.message} ({job.uuid})"))
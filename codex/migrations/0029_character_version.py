@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0028_alter_character_bastion_alter_character_campaign_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="character",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="Incremented whenever the character, its items or its downtime events change",
+            ),
+        ),
+    ]
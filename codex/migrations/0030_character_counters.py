@@ -0,0 +1,62 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_for_character(model, field="character"):
+    rows = model.objects.filter(**{field: OuterRef("pk")}).order_by().values(field)
+    return Coalesce(
+        Subquery(rows.annotate(total=Count("pk")).values("total")),
+        Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def populate_counters(apps, schema_editor):
+    """Calculate the counters for existing characters"""
+    Character = apps.get_model("codex", "Character")
+    MagicItem = apps.get_model("codex", "MagicItem")
+    Game = apps.get_model("codex", "Game")
+    FreeForm = apps.get_model("codex", "FreeForm")
+    SpellbookUpdate = apps.get_model("codex", "SpellbookUpdate")
+
+    Character.objects.update(
+        item_count=count_for_character(MagicItem),
+        game_count=count_for_character(Game.characters.through),
+        event_count=count_for_character(FreeForm)
+        + count_for_character(SpellbookUpdate),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0029_character_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="character",
+            name="event_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of downtime events logged"
+            ),
+        ),
+        migrations.AddField(
+            model_name="character",
+            name="game_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of games played"
+            ),
+        ),
+        migrations.AddField(
+            model_name="character",
+            name="item_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of magic items held"
+            ),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
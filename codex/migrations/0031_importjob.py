@@ -0,0 +1,132 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:39
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0030_character_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("uuid", models.UUIDField(default=uuid.uuid4, editable=False)),
+                (
+                    "filename",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Name of the uploaded file",
+                        max_length=256,
+                    ),
+                ),
+                (
+                    "data",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Export contents, cleared once imported",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("complete", "Complete"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "message",
+                    models.TextField(
+                        blank=True, default="", help_text="Reason for failure"
+                    ),
+                ),
+                (
+                    "events_parsed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Events read from the export"
+                    ),
+                ),
+                (
+                    "games_created",
+                    models.PositiveIntegerField(default=0, help_text="Games created"),
+                ),
+                (
+                    "items_created",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Magic items created"
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="When the job was submitted"
+                    ),
+                ),
+                (
+                    "started",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the worker picked up the job",
+                        null=True,
+                    ),
+                ),
+                (
+                    "finished",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the job completed or failed",
+                        null=True,
+                    ),
+                ),
+                (
+                    "character",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Character created by the import",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="codex.character",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="import_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import job",
+                "indexes": [
+                    models.Index(fields=["uuid"], name="importjob_uuid_idx"),
+                    models.Index(
+                        fields=["status", "created"], name="importjob_queue_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_reference_copies(apps, schema_editor):
+    """Match existing copies of game reward items to the reference item they were made from by name"""
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    game_type = ContentType.objects.filter(app_label="codex", model="game").first()
+    if not game_type:
+        return
+
+    for copy_model, reference_model in [
+        (
+            apps.get_model("codex", "MagicItem"),
+            apps.get_model("codex", "ReferenceMagicItem"),
+        ),
+        (
+            apps.get_model("codex", "Consumable"),
+            apps.get_model("codex", "ReferenceConsumable"),
+        ),
+    ]:
+        references = {}
+        for reference in reference_model.objects.order_by("pk"):
+            references.setdefault(reference.game_id, []).append(reference)
+
+        linked = []
+        used = set()
+        copies = copy_model.objects.filter(
+            content_type=game_type, reference__isnull=True
+        ).order_by("pk")
+        for copy in copies.iterator():
+            for reference in references.get(copy.object_id, []):
+                if (
+                    reference.name == copy.name
+                    and (copy.character_id, reference.pk) not in used
+                ):
+                    used.add((copy.character_id, reference.pk))
+                    copy.reference_id = reference.pk
+                    linked.append(copy)
+                    break
+        copy_model.objects.bulk_update(linked, ["reference"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0031_importjob"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="consumable",
+            name="reference",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Game reward that this consumable was copied from",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="copies",
+                to="codex.referenceconsumable",
+            ),
+        ),
+        migrations.AddField(
+            model_name="magicitem",
+            name="reference",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Game reward that this item was copied from",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="copies",
+                to="codex.referencemagicitem",
+            ),
+        ),
+        migrations.RunPython(link_reference_copies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0032_item_reference"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dmreward",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the event was last changed"
+            ),
+        ),
+        migrations.AddField(
+            model_name="freeform",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the event was last changed"
+            ),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the event was last changed"
+            ),
+        ),
+        migrations.AddField(
+            model_name="spellbookupdate",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the event was last changed"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dmreward",
+            index=models.Index(
+                fields=["character_items_assigned", "datetime"],
+                name="dmreward_timeline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dmreward",
+            index=models.Index(
+                fields=["character_items_assigned", "updated"],
+                name="dmreward_changes_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="freeform",
+            index=models.Index(
+                fields=["character", "datetime"], name="event_freeform_timeline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="freeform",
+            index=models.Index(
+                fields=["character", "updated"], name="event_freeform_changes_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="spellbookupdate",
+            index=models.Index(
+                fields=["character", "datetime"], name="event_sbookupd_timeline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="spellbookupdate",
+            index=models.Index(
+                fields=["character", "updated"], name="event_sbookupd_changes_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0033_event_updated"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["datetime"], name="game_datetime_idx"),
+        ),
+    ]
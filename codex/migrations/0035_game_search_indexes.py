@@ -0,0 +1,63 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:04
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+TRIGRAM_FIELDS = ["module", "name", "dm_name", "location"]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Trigram indexes let Postgres use an index for LIKE searches, other databases use the functional indexes"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS game_{field}_trgm_idx ON codex_game USING gin (UPPER({field}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS game_{field}_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0034_game_datetime_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                django.db.models.functions.text.Upper("module"),
+                name="game_module_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"),
+                name="game_name_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                django.db.models.functions.text.Upper("dm_name"),
+                name="game_dm_name_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                django.db.models.functions.text.Upper("location"),
+                name="game_location_upper_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
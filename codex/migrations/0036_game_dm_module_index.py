@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0035_game_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["dm", "module", "datetime"], name="game_dm_module_datetime_idx"
+            ),
+        ),
+    ]
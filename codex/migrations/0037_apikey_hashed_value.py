@@ -0,0 +1,58 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:20
+
+import hashlib
+
+import codex.models.api_keys
+
+from django.db import migrations, models
+
+
+def hash_existing_keys(apps, schema_editor):
+    """Hash the stored keys and keep only the start of each one for identification"""
+    APIKey = apps.get_model("codex", "APIKey")
+    keys = list(APIKey.objects.all())
+    for key in keys:
+        key.hashed_value = hashlib.sha256(key.value.encode()).hexdigest()
+        key.value = key.value[:8] + "..."
+    APIKey.objects.bulk_update(keys, ["hashed_value", "value"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0036_game_dm_module_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apikey",
+            name="hashed_value",
+            field=models.CharField(
+                editable=False,
+                help_text="SHA-256 of the key value",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        # Existing keys can't be recovered from their hashes, so this can't be reversed
+        migrations.RunPython(hash_existing_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="apikey",
+            name="hashed_value",
+            field=models.CharField(
+                editable=False,
+                help_text="SHA-256 of the key value",
+                max_length=64,
+                unique=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="apikey",
+            name="value",
+            field=models.CharField(
+                default=codex.models.api_keys.generate_random_key,
+                help_text="Key value, only the start of it is kept once saved",
+                max_length=64,
+            ),
+        ),
+    ]
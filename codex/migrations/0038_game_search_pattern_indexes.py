@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:05
+
+from django.db import migrations
+
+PATTERN_FIELDS = ["module", "name", "dm_name", "location"]
+
+
+def create_pattern_indexes(apps, schema_editor):
+    """Postgres can only use a btree index for LIKE 'prefix%' with a pattern operator class, other databases
+    search prefixes as a range over the functional indexes from 0035"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in PATTERN_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS game_{field}_pattern_idx ON codex_game (UPPER({field}) text_pattern_ops)"
+        )
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in PATTERN_FIELDS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS game_{field}_pattern_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0037_apikey_hashed_value"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pattern_indexes, drop_pattern_indexes),
+    ]
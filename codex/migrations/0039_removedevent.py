@@ -0,0 +1,71 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("codex", "0038_game_search_pattern_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RemovedEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_uuid",
+                    models.UUIDField(help_text="UUID of the event that was removed"),
+                ),
+                (
+                    "removed_event_type",
+                    models.CharField(
+                        help_text="Timeline type of the event that was removed",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "datetime",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the removed event took place",
+                        null=True,
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the event was removed",
+                    ),
+                ),
+                (
+                    "character",
+                    models.ForeignKey(
+                        help_text="Character losing the event",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="removed_events",
+                        to="codex.character",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["character", "updated"], name="removedevent_changes_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -4,6 +4,7 @@ from . import events_downtime
 from . import items
 from . import items_reference
 from . import dungeonmaster
+from . import imports
 
 from .api_keys import APIKey
 from .users import CodexUser
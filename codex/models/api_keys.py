@@ -1,22 +1,35 @@
 import uuid
 import random
 import string
+import hashlib
 from django.db import models
 
 from codex.models.users import CodexUser
 
+KEY_PREFIX_LENGTH = 8
+KEY_MASK = '...'
+
+
 def generate_random_key():
     """ Randomly generate an API key """
     key = ''.join(random.choices(string.ascii_letters + string.digits, k=64))
     return key
 
 
+def hash_key(key: str) -> str:
+    """ Hash a key for storage and lookup, keys are random so an unsalted hash is enough """
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
 class APIKey(models.Model):
     """ An authentication token for bot access """
     uuid = models.UUIDField(default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=128, help_text="Key name")
     description = models.TextField(blank=True, null=True, help_text='Description of the key usage')
-    value = models.CharField(max_length=64, default=generate_random_key, help_text='Key value')
+    value = models.CharField(
+        max_length=64, default=generate_random_key, help_text='Key value, only the start of it is kept once saved'
+    )
+    hashed_value = models.CharField(max_length=64, unique=True, editable=False, help_text='SHA-256 of the key value')
 
     datetime = models.DateTimeField(auto_now_add=True, help_text='When the key was created')
     user = models.ForeignKey(CodexUser, on_delete=models.CASCADE, related_name='api_keys')
@@ -24,6 +37,22 @@ class APIKey(models.Model):
     def __str__(self):
         return f"{self.name}"
 
+    def save(self, *args, **kwargs):
+        """ Store a new key value as its hash, the full value is only available on this instance """
+        key = self.value
+        if key and not key.endswith(KEY_MASK):
+            if self.pk:
+                # the replaced key is forgotten by the cache along with the new one once this is saved
+                self._replaced_hashed_value = (
+                    APIKey.objects.filter(pk=self.pk).values_list('hashed_value', flat=True).first()
+                )
+            self.hashed_value = hash_key(key)
+            self.value = key[:KEY_PREFIX_LENGTH] + KEY_MASK
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            self.value = key
+
 
     class Meta:
         verbose_name = 'API key'
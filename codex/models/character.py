@@ -1,3 +1,4 @@
+import copy
 import uuid
 import random
 import string
@@ -18,6 +19,10 @@ def get_user_token_path(instance, filename):
     return f"{instance.player.pk}/tokens/{instance.name}/{rand_string}-{filename}"
 
 
+# Fields updated in SQL by codex.utils.character rather than written from model instances
+DATABASE_MAINTAINED_FIELDS = ["item_count", "game_count", "event_count", "version"]
+
+
 class Character(models.Model):
     """Representation of a character"""
 
@@ -64,6 +69,14 @@ class Character(models.Model):
         verbose_name="DM help text",
         help_text="Any information that may be useful for your DM to know ahead of time",
     )
+    # Denormalised counts, maintained by codex.utils.character.update_character_counters
+    item_count = models.PositiveIntegerField(default=0, help_text="Number of magic items held")
+    game_count = models.PositiveIntegerField(default=0, help_text="Number of games played")
+    event_count = models.PositiveIntegerField(default=0, help_text="Number of downtime events logged")
+    # Change tracking
+    version = models.PositiveIntegerField(
+        default=1, help_text="Incremented whenever the character, its items or its downtime events change"
+    )
 
     def __str__(self):
         """String representation"""
@@ -71,18 +84,73 @@ class Character(models.Model):
             return f"{self.player.username} - {self.name}"
         return f"[Orphaned] - {self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the classes and level as loaded so that unchanged classes are not re-parsed on save"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_classes = copy.deepcopy(instance.__dict__.get("classes"))
+        instance._loaded_level = instance.__dict__.get("level")
+        return instance
+
+    @staticmethod
+    def calculate_level(classes) -> int:
+        """Total level from a list of class objects, 1 if the classes are not valid"""
+        if not isinstance(classes, list) or not classes:
+            return 1
+
+        total = 0
+        for character_class in classes:
+            if not isinstance(character_class, dict):
+                return 1
+            value = character_class.get("value")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return 1
+            total += int(value)
+        return total
+
+    def level_needs_recalculating(self) -> bool:
+        """Level only needs deriving again if the classes (or the level itself) were changed since loading"""
+        if self._state.adding or not hasattr(self, "_loaded_classes"):
+            return True
+        return self.classes != self._loaded_classes or self.level != self._loaded_level
+
     def save(self, *args, **kwargs):
-        """Override save method to auto calculate level from class levels"""
-        # coerce classes to a list if given a single instance
-        if type(self.classes) == dict:
-            self.classes = [self.classes]
-
-        accumulator = 0
-        try:
-            for item in self.classes:
-                accumulator += item["value"]
-            self.level = accumulator
-        except Exception:
-            self.level = 1
+        """Override save method to auto calculate level from class levels when the classes change"""
+        update_fields = kwargs.get("update_fields")
+        recalculate = update_fields is None or {"classes", "level"} & set(update_fields)
+        if recalculate and "classes" not in self.get_deferred_fields():
+            # coerce classes to a list if given a single instance
+            if type(self.classes) == dict:
+                self.classes = [self.classes]
+
+            if self.level_needs_recalculating():
+                self.level = self.calculate_level(self.classes)
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "level"}
+            self._loaded_classes = copy.deepcopy(self.classes)
+            self._loaded_level = self.level
 
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        # Counters and version are maintained in the database, so never write back possibly stale values
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                f.attname for f in self._meta.concrete_fields if not f.primary_key and f.attname not in deferred
+            ]
+        kwargs["update_fields"] = (set(update_fields) - set(DATABASE_MAINTAINED_FIELDS)) | {"version"}
+        self.version = models.F("version") + 1
         super().save(*args, **kwargs)
+        # Drop the now unknown values so they are only read back from the database if something uses them
+        for field in DATABASE_MAINTAINED_FIELDS:
+            self.__dict__.pop(field, None)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """Load all of the database maintained fields together when one of them is read after a save"""
+        if fields is not None and set(fields) <= set(DATABASE_MAINTAINED_FIELDS):
+            deferred = self.get_deferred_fields()
+            fields = [field for field in DATABASE_MAINTAINED_FIELDS if field in fields or field in deferred]
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
@@ -17,6 +18,7 @@ class Game(models.Model):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False)
     owner = models.ForeignKey(CodexUser, blank=True, null=True, on_delete=models.SET_NULL)
     datetime = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    updated = models.DateTimeField(auto_now=True, help_text="When the event was last changed")
 
     name = models.CharField(max_length=128, blank=True, null=True, help_text="Module name")
     dm = models.ForeignKey(
@@ -44,6 +46,17 @@ class Game(models.Model):
             return f"{self.datetime.strftime('%Y/%m/%d')} - {self.name}"
         return f"UNKNOWN DATE - {self.name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["datetime"], name="game_datetime_idx"),
+            models.Index(fields=["dm", "module", "datetime"], name="game_dm_module_datetime_idx"),
+            # Case insensitive prefix search, Postgres also gets trigram indexes on these in migration 0035
+            models.Index(Upper("module"), name="game_module_upper_idx"),
+            models.Index(Upper("name"), name="game_name_upper_idx"),
+            models.Index(Upper("dm_name"), name="game_dm_name_upper_idx"),
+            models.Index(Upper("location"), name="game_location_upper_idx"),
+        ]
+
 
 class Trade(models.Model):
     """Trade record"""
@@ -78,6 +91,7 @@ class DMReward(models.Model):
 
     uuid = models.UUIDField(default=uuid.uuid4, editable=False)
     datetime = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    updated = models.DateTimeField(auto_now=True, help_text="When the event was last changed")
 
     name = models.CharField(max_length=128, blank=True, null=True, help_text="Service reward name")
     dm = models.ForeignKey(
@@ -108,6 +122,12 @@ class DMReward(models.Model):
     def __str__(self):
         return f"{self.dm.player.username} - {self.name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["character_items_assigned", "datetime"], name="dmreward_timeline_idx"),
+            models.Index(fields=["character_items_assigned", "updated"], name="dmreward_changes_idx"),
+        ]
+
 
 class ManualCreation(models.Model):
     """An instance where a user has directly created an item, perhaps an import"""
@@ -140,3 +160,24 @@ class ManualEdit(models.Model):
         if self.datetime:
             return f"{self.datetime.strftime('%Y/%m/%d')} - {self.name}"
         return f"UNKNOWN DATE - {self.name}"
+
+
+class RemovedEvent(models.Model):
+    """A marker left when an event leaves a character's timeline, so that clients fetching changes can drop it"""
+
+    event_uuid = models.UUIDField(help_text="UUID of the event that was removed")
+    removed_event_type = models.CharField(max_length=16, help_text="Timeline type of the event that was removed")
+    datetime = models.DateTimeField(null=True, blank=True, help_text="When the removed event took place")
+    updated = models.DateTimeField(default=timezone.now, help_text="When the event was removed")
+
+    character = models.ForeignKey(
+        Character, on_delete=models.CASCADE, related_name="removed_events", help_text="Character losing the event"
+    )
+
+    def __str__(self):
+        return f"{self.removed_event_type} {self.event_uuid} removed from {self.character.name}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["character", "updated"], name="removedevent_changes_idx"),
+        ]
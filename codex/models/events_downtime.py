@@ -11,6 +11,7 @@ class FreeForm(models.Model):
 
     uuid = models.UUIDField(default=uuid.uuid4, editable=False)
     datetime = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    updated = models.DateTimeField(auto_now=True, help_text="When the event was last changed")
 
     character = models.ForeignKey(Character, null=True, on_delete=models.CASCADE)
     title = models.CharField(max_length=256, default="Freeform event")
@@ -32,6 +33,8 @@ class FreeForm(models.Model):
         indexes = [
             models.Index(fields=["uuid"], name="event_freeform_uuid_idx"),
             models.Index(fields=["character"], name="event_freeform_character_idx"),
+            models.Index(fields=["character", "datetime"], name="event_freeform_timeline_idx"),
+            models.Index(fields=["character", "updated"], name="event_freeform_changes_idx"),
         ]
 
 
@@ -40,6 +43,7 @@ class SpellbookUpdate(models.Model):
 
     uuid = models.UUIDField(default=uuid.uuid4, editable=False)
     datetime = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    updated = models.DateTimeField(auto_now=True, help_text="When the event was last changed")
 
     character = models.ForeignKey(Character, null=True, on_delete=models.CASCADE)
     gold = models.FloatField(default=0, help_text="Gold spent on reagents")
@@ -57,4 +61,6 @@ class SpellbookUpdate(models.Model):
         indexes = [
             models.Index(fields=["uuid"], name="event_sbookupd_uuid_idx"),
             models.Index(fields=["character"], name="event_sbookupd_character_idx"),
+            models.Index(fields=["character", "datetime"], name="event_sbookupd_timeline_idx"),
+            models.Index(fields=["character", "updated"], name="event_sbookupd_changes_idx"),
         ]
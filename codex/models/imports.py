@@ -0,0 +1,44 @@
+import uuid
+from django.db import models
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+
+
+class ImportJob(models.Model):
+    """An Adventurers League Logs export queued for import by the import worker"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        COMPLETE = "complete"
+        FAILED = "failed"
+
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CodexUser, on_delete=models.CASCADE, related_name="import_jobs")
+    filename = models.CharField(max_length=256, blank=True, default="", help_text="Name of the uploaded file")
+    data = models.TextField(blank=True, default="", help_text="Export contents, cleared once imported")
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    message = models.TextField(blank=True, default="", help_text="Reason for failure")
+    character = models.ForeignKey(
+        Character, null=True, blank=True, on_delete=models.SET_NULL, help_text="Character created by the import"
+    )
+
+    events_parsed = models.PositiveIntegerField(default=0, help_text="Events read from the export")
+    games_created = models.PositiveIntegerField(default=0, help_text="Games created")
+    items_created = models.PositiveIntegerField(default=0, help_text="Magic items created")
+
+    created = models.DateTimeField(auto_now_add=True, help_text="When the job was submitted")
+    started = models.DateTimeField(null=True, blank=True, help_text="When the worker picked up the job")
+    finished = models.DateTimeField(null=True, blank=True, help_text="When the job completed or failed")
+
+    def __str__(self):
+        return f"{self.filename or self.uuid} ({self.status})"
+
+    class Meta:
+        verbose_name = "Import job"
+        indexes = [
+            models.Index(fields=["uuid"], name="importjob_uuid_idx"),
+            models.Index(fields=["status", "created"], name="importjob_queue_idx"),
+        ]
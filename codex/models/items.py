@@ -53,6 +53,14 @@ class Consumable(models.Model):
         verbose_name="Event ID", null=True, help_text="ID of the specific source event"
     )
     source = GenericForeignKey("content_type", "object_id")
+    reference = models.ForeignKey(
+        "codex.ReferenceConsumable",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="copies",
+        help_text="Game reward that this consumable was copied from",
+    )
 
     def __str__(self):
         """String representation"""
@@ -92,6 +100,14 @@ class MagicItem(models.Model):
         verbose_name="Event ID", null=True, help_text="ID of the specific source event"
     )
     source = GenericForeignKey("content_type", "object_id")
+    reference = models.ForeignKey(
+        "codex.ReferenceMagicItem",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="copies",
+        help_text="Game reward that this item was copied from",
+    )
 
     def __str__(self):
         """String representation"""
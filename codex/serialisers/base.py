@@ -24,3 +24,15 @@ class MoonseaCodexSerialiser(serializers.ModelSerializer):
             return False
         except Exception:
             return False
+
+
+class DynamicFieldsSerialiser(serializers.ModelSerializer):
+    """Model serialiser that can be limited to a subset of its fields with a `fields` argument"""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
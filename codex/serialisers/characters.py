@@ -1,10 +1,11 @@
 from rest_framework import serializers
 
 from codex.models.character import Character
+from codex.serialisers.base import DynamicFieldsSerialiser
 from codex.serialisers.items import MagicItemSerialiser, ConsumableItemSerialiser
 
 
-class CharacterDetailsSerialiser(serializers.ModelSerializer):
+class CharacterDetailsSerialiser(DynamicFieldsSerialiser):
     """Serialiser to use for individual player characters, includes inventories"""
 
     editable = serializers.SerializerMethodField()
@@ -14,22 +15,44 @@ class CharacterDetailsSerialiser(serializers.ModelSerializer):
     class Meta:
         model = Character
         exclude = ["id", "player", "public"]
-        read_only_fields = ["uuid", "artwork", "token"]
+        read_only_fields = ["uuid", "artwork", "token", "version", "item_count", "game_count", "event_count"]
 
     def get_editable(self, obj):
         try:
             user = self.context.get("user")
-            if user and obj.player == user:
+            if user and user.pk and obj.player_id == user.pk:
                 return True
             return False
         except Exception:
             return False
 
 
+class CharacterSummarySerialiser(serializers.ModelSerializer):
+    """Lightweight serialiser for character rosters and pickers, no biography or inventories"""
+
+    class Meta:
+        model = Character
+        fields = [
+            "uuid",
+            "name",
+            "race",
+            "level",
+            "classes",
+            "season",
+            "campaign",
+            "artwork",
+            "token",
+            "item_count",
+            "game_count",
+            "event_count",
+        ]
+        read_only_fields = fields
+
+
 class CharacterSerialiser(serializers.ModelSerializer):
     """Serialiser to use for creating or updating player characters"""
 
     class Meta:
         model = Character
         exclude = ["player"]
-        read_only_fields = ["uuid", "artwork", "token"]
+        read_only_fields = ["uuid", "artwork", "token", "version", "item_count", "game_count", "event_count"]
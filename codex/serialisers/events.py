@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from codex.models.events import Game, DMReward, ManualCreation, Trade, ManualEdit
+from codex.models.events import Game, DMReward, ManualCreation, Trade, ManualEdit, RemovedEvent
 
 
 class MagicItemOriginGameSerialiser(serializers.ModelSerializer):
@@ -50,3 +50,13 @@ class MagicItemEditEventSerialiser(serializers.ModelSerializer):
     class Meta:
         model = ManualEdit
         fields = ["uuid", "datetime", "name", "character", "details", "item_uuid", "event_type"]
+
+
+class RemovedEventSerialiser(serializers.ModelSerializer):
+    """ Serialiser for an event that has left a character's timeline """
+    event_type = serializers.ReadOnlyField(default="removed")
+    uuid = serializers.UUIDField(source="event_uuid", read_only=True)
+
+    class Meta:
+        model = RemovedEvent
+        fields = ["uuid", "datetime", "updated", "removed_event_type", "event_type"]
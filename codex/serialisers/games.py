@@ -15,6 +15,18 @@ class PartyCharacterSerialiser(serializers.ModelSerializer):
         fields = [*read_only_fields]
 
 
+class GameReferenceMagicItemSerialiser(ReferenceMagicItemSerialiser):
+    """Reference item within a game, an existing item's uuid can be given to update it in place"""
+
+    uuid = serializers.UUIDField(required=False)
+
+
+class GameReferenceConsumableSerialiser(ReferenceConsumableSerialiser):
+    """Reference consumable within a game, an existing consumable's uuid can be given to update it in place"""
+
+    uuid = serializers.UUIDField(required=False)
+
+
 class GameSerialiser(MoonseaCodexSerialiser):
     """serialiser for games played"""
 
@@ -22,8 +34,8 @@ class GameSerialiser(MoonseaCodexSerialiser):
     dm_uuid = serializers.ReadOnlyField(source="dm.uuid")
     characters = PartyCharacterSerialiser(many=True, read_only=True)
 
-    magicitems = ReferenceMagicItemSerialiser(many=True, required=False)
-    consumables = ReferenceConsumableSerialiser(many=True, required=False)
+    magicitems = GameReferenceMagicItemSerialiser(many=True, required=False)
+    consumables = GameReferenceConsumableSerialiser(many=True, required=False)
 
     class Meta:
         model = Game
@@ -58,25 +70,50 @@ class GameSerialiser(MoonseaCodexSerialiser):
             game = Game(**validated_data)
             game.save()
 
-            for item in reference_items:
-                ReferenceMagicItem.objects.create(game=game, **item)
-            for consumable in reference_consumables:
-                ReferenceConsumable.objects.create(game=game, **consumable)
+            for model, items in [(ReferenceMagicItem, reference_items), (ReferenceConsumable, reference_consumables)]:
+                for item in items:
+                    item.pop("uuid", None)
+                model.objects.bulk_create(model(game=game, **item) for item in items)
         return game
 
+    def update_reference_items(self, game, model, items):
+        """Make a game's reference items match the list given, items with a known uuid are updated in place"""
+        existing = {item.uuid: item for item in model.objects.filter(game=game)}
+        kept = set()
+        updated = []
+        updated_fields = set()
+        created = []
+
+        for data in items:
+            item = existing.get(data.pop("uuid", None))
+            if not item or item.uuid in kept:
+                created.append(model(game=game, **data))
+                continue
+
+            kept.add(item.uuid)
+            changed = [field for field, value in data.items() if getattr(item, field) != value]
+            for field in changed:
+                setattr(item, field, data[field])
+            if changed:
+                updated.append(item)
+                updated_fields.update(changed)
+
+        if len(kept) < len(existing):
+            model.objects.filter(game=game).exclude(uuid__in=kept).delete()
+        if updated:
+            model.objects.bulk_update(updated, sorted(updated_fields))
+        if created:
+            model.objects.bulk_create(created)
+
     def update(self, instance, validated_data):
         with transaction.atomic():
-            reference_items = validated_data.pop("magicitems", [])
-            reference_consumables = validated_data.pop("consumables", [])
+            reference_items = validated_data.pop("magicitems", None)
+            reference_consumables = validated_data.pop("consumables", None)
             instance = super().update(instance, validated_data)
 
-            # Delete existing items and consumables
-            ReferenceMagicItem.objects.filter(game=instance).delete()
-            ReferenceConsumable.objects.filter(game=instance).delete()
-
-            # Create new items and consumables
-            for item in reference_items:
-                ReferenceMagicItem.objects.create(game=instance, **item)
-            for consumable in reference_consumables:
-                ReferenceConsumable.objects.create(game=instance, **consumable)
+            # Reference items are only changed when they are included in the request
+            if reference_items is not None:
+                self.update_reference_items(instance, ReferenceMagicItem, reference_items)
+            if reference_consumables is not None:
+                self.update_reference_items(instance, ReferenceConsumable, reference_consumables)
         return instance
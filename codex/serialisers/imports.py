@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from codex.models.imports import ImportJob
+
+
+class ImportJobSerialiser(serializers.ModelSerializer):
+    character_uuid = serializers.ReadOnlyField(source="character.uuid")
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "uuid",
+            "filename",
+            "status",
+            "message",
+            "character_uuid",
+            "events_parsed",
+            "games_created",
+            "items_created",
+            "created",
+            "started",
+            "finished",
+        ]
+        read_only_fields = fields
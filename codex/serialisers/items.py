@@ -16,7 +16,7 @@ class ItemSerialiser(serializers.ModelSerializer):
     def get_editable(self, obj):
         try:
             user = self.context.get("user")
-            if user and obj.character.player == user:
+            if user and user.pk and obj.character.player_id == user.pk:
                 return True
             return False
         except Exception:
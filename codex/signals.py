@@ -1,11 +1,129 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
+from django.utils import timezone
 
+from codex.models.api_keys import APIKey
+from codex.models.character import Character
 from codex.models.dungeonmaster import DungeonMasterInfo
+from codex.models.items import MagicItem, Consumable
+from codex.models.events import Game, DMReward, RemovedEvent
+from codex.models.events_downtime import FreeForm, SpellbookUpdate
+from codex.imports.items import forget_canonical_item
+from codex.utils.api_keys import forget_api_key
+from codex.utils.character import bump_character_version, update_character_counters
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_dm_info(sender, instance=None, created=False, **kwargs):
     """ On user creation we create a DM log for that user """
     if created:
         DungeonMasterInfo.objects.create(player=instance)
+
+
+def deleted_with_character(origin) -> bool:
+    """ Whether a delete cascaded from a character or its player, so there's no character left to update """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (Character, get_user_model()))
+
+
+@receiver(post_save, sender=MagicItem)
+@receiver(post_save, sender=Consumable)
+@receiver(post_save, sender=FreeForm)
+@receiver(post_save, sender=SpellbookUpdate)
+@receiver(post_delete, sender=Consumable)
+def update_character_version(sender, instance=None, created=False, origin=None, **kwargs):
+    """ Changes to inventories or downtime events change the owning character """
+    if origin is not None and deleted_with_character(origin):
+        return
+    if created and sender is not Consumable:
+        update_character_counters(instance.character_id)
+    else:
+        bump_character_version(instance.character_id)
+
+
+@receiver(post_delete, sender=MagicItem)
+@receiver(post_delete, sender=FreeForm)
+@receiver(post_delete, sender=SpellbookUpdate)
+def remove_from_character_counters(sender, instance=None, origin=None, **kwargs):
+    """ Counted objects being removed need the owning character's counters recalculating """
+    if deleted_with_character(origin):
+        return
+    update_character_counters(instance.character_id)
+
+
+def record_removed_events(event_type, events, character_ids, origin=None):
+    """ Leave markers in the timelines that events are leaving, so clients fetching changes know to drop them """
+    characters = Character.objects.filter(pk__in=[pk for pk in character_ids if pk])
+    if origin is not None and deleted_with_character(origin):
+        # characters deleted along with the events have no timeline left to mark
+        if issubclass(origin.model if isinstance(origin, QuerySet) else type(origin), Character):
+            return
+        characters = characters.exclude(player__in=origin if isinstance(origin, QuerySet) else [origin])
+    character_ids = list(characters.values_list("pk", flat=True))
+    RemovedEvent.objects.bulk_create(
+        RemovedEvent(character_id=pk, removed_event_type=event_type, event_uuid=event.uuid, datetime=event.datetime)
+        for event in events
+        for pk in character_ids
+    )
+
+
+@receiver(pre_delete, sender=Game)
+@receiver(pre_delete, sender=DMReward)
+@receiver(pre_delete, sender=FreeForm)
+@receiver(pre_delete, sender=SpellbookUpdate)
+def record_deleted_event(sender, instance=None, origin=None, **kwargs):
+    """ Deleted events leave the timeline of every character they were part of """
+    if sender is Game:
+        record_removed_events("game", [instance], instance.characters.values_list("pk", flat=True), origin)
+    elif sender is DMReward:
+        record_removed_events("dm_reward", [instance], [instance.character_items_assigned_id], origin)
+    elif sender is FreeForm:
+        record_removed_events("dt_freeform", [instance], [instance.character_id], origin)
+    else:
+        record_removed_events("dt_sbookupd", [instance], [instance.character_id], origin)
+
+
+@receiver(m2m_changed, sender=Game.characters.through)
+def update_character_game_counters(sender, instance=None, action="", reverse=False, pk_set=None, **kwargs):
+    """ Keep game counts in step with characters joining or leaving games """
+    if action == "pre_clear":
+        if reverse:
+            instance._cleared_game_ids = list(instance.games.values_list("pk", flat=True))
+        else:
+            instance._cleared_character_ids = list(instance.characters.values_list("pk", flat=True))
+        return
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+
+    if action == "post_clear":
+        changed_ids = getattr(instance, "_cleared_game_ids" if reverse else "_cleared_character_ids", [])
+    else:
+        changed_ids = pk_set
+    (character_ids, game_ids) = ([instance.pk], changed_ids) if reverse else (changed_ids, [instance.pk])
+    update_character_counters(*character_ids)
+
+    if action != "post_add":
+        # A game a character leaves is marked as removed from their timeline
+        record_removed_events("game", Game.objects.filter(pk__in=game_ids).only("uuid", "datetime"), character_ids)
+    # A game is new to the timeline of a character joining it, and has changed for the characters still in it
+    Game.objects.filter(pk__in=game_ids).update(updated=timezone.now())
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key_cache(sender, instance=None, **kwargs):
+    """ Keys that have been changed or deleted must be checked against the database again """
+    if instance and instance.hashed_value:
+        forget_api_key(instance.hashed_value)
+    if instance and getattr(instance, "_replaced_hashed_value", None):
+        forget_api_key(instance._replaced_hashed_value)
+
+
+@receiver(post_save, sender=MagicItem)
+@receiver(post_delete, sender=MagicItem)
+def invalidate_canonical_items(sender, instance=None, **kwargs):
+    """ Imports borrow details from existing items, so changes to them must be seen by the next import """
+    if instance:
+        forget_canonical_item(instance.name)
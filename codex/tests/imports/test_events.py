@@ -0,0 +1,83 @@
+import csv
+import io
+import time
+import tracemalloc
+
+from django.test import TestCase
+
+from codex.imports.adventurersleaguelogs import ALLGameEvent, ALLItemEvent, ALLItemTradeEvent
+from codex.imports.parse_events import parse_events
+
+
+def make_rows(games: int) -> io.StringIO:
+    """Build the event section of a synthetic export with a game, an item and a trade per game"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    for i in range(games):
+        writer.writerow(
+            [
+                "CharacterLogEntry",
+                f"DDAL00-01 Game {i}",
+                "",
+                "2024-01-01",
+                "4",
+                "",
+                "",
+                "100",
+                "10",
+                "",
+                "",
+                "Online",
+                "Some DM",
+                "",
+                "Fought goblins, found loot",
+                "",
+                "",
+            ]
+        )
+        writer.writerow(
+            ["MAGIC ITEM", f"Wand of Test {i}", "uncommon", "", "", "", "Taken from the lich, lightly used"]
+        )
+        writer.writerow(["TRADED MAGIC ITEM", f"Wand of Test {i}", "uncommon", "", "", "", ""])
+    output.seek(0)
+    return output
+
+
+class ALLEventParserTest(TestCase):
+    """Tests for parsing the events section of an Adventurers League Logs export"""
+
+    def test_quoted_fields(self):
+        """Commas inside quoted notes do not shift the columns"""
+        events = parse_events(csv.reader(make_rows(1)))
+        self.assertEqual([type(event) for event in events], [ALLGameEvent, ALLItemEvent, ALLItemTradeEvent])
+        self.assertEqual(events[0].notes, "Fought goblins, found loot")
+        self.assertEqual(events[0].dm_name, "Some DM")
+        self.assertEqual(events[1].notes, "Taken from the lich, lightly used")
+
+    def test_unknown_and_short_rows_skipped(self):
+        """Unknown event types, blank lines, headers and truncated rows are ignored"""
+        rows = csv.reader(
+            ["", "MAGIC ITEM,name,rarity", "DOWNTIME,Carousing", "CharacterLogEntry,Short", "MAGIC ITEM,,rare,,,,"]
+        )
+        self.assertEqual(parse_events(rows), [])
+
+    def test_events_use_slots(self):
+        """Events don't carry a per-instance dictionary"""
+        events = parse_events(csv.reader(make_rows(1)))
+        for event in events:
+            self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_parse_benchmark(self):
+        """A 10k row export parses quickly and without excessive memory use"""
+        export = make_rows(3334)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        events = parse_events(csv.reader(export))
+        elapsed = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertEqual(len(events), 10002)
+        self.assertLess(elapsed, 5, f"{len(events) / elapsed:.0f} rows/s")
+        self.assertLess(peak, 16 * 1024 * 1024, f"{peak / 1024:.0f}KiB peak")
@@ -0,0 +1,34 @@
+import sys
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import TestCase
+
+from codex.imports.games import parse_game_date
+
+
+class ALLGameDateTest(TestCase):
+    """Tests for converting ALL export dates"""
+
+    def setUp(self):
+        parse_game_date.cache_clear()
+
+    def test_known_formats(self):
+        """The formats used by ALL exports are parsed without dateparser"""
+        with mock.patch.dict(sys.modules, {"dateparser": None}):
+            self.assertEqual(parse_game_date("2024-03-01 18:30:00"), datetime(2024, 3, 1, 18, 30))
+            self.assertEqual(parse_game_date("2024-03-01"), datetime(2024, 3, 1))
+            self.assertEqual(
+                parse_game_date("2024-03-01 18:30:00 UTC"), datetime(2024, 3, 1, 18, 30, tzinfo=timezone.utc)
+            )
+            self.assertIsNone(parse_game_date(""))
+
+    def test_fallback(self):
+        """Other formats fall back to dateparser and the result is cached"""
+        self.assertEqual(parse_game_date("1st March 2024"), datetime(2024, 3, 1))
+        self.assertIsNone(parse_game_date("not a date"))
+
+        with mock.patch("dateparser.parse") as dateparser_parse:
+            parse_game_date("1st March 2024")
+            dateparser_parse.assert_not_called()
+        self.assertEqual(parse_game_date.cache_info().hits, 1)
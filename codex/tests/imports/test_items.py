@@ -0,0 +1,116 @@
+import csv
+import random
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from codex.models.character import Character
+from codex.models.items import MagicItem
+from codex.imports import items
+from codex.imports.items import create_msc_items, get_canonical_items, get_canonical_item_cache_key
+from codex.imports.items import remove_traded_items
+from codex.imports.parse_events import parse_events
+
+
+def remove_traded_items_reference(items, traded):
+    """The original quadratic implementation, kept to check the behaviour of the replacement"""
+    items = list(items)
+    for traded_item in traded:
+        for item in items:
+            if traded_item.name == item.name and traded_item.rarity == item.rarity:
+                items.remove(item)
+                break
+    return items
+
+
+class ALLTradedItemTest(TestCase):
+    """Tests for removing traded items from the items gained by a character"""
+
+    def make_items(self, rng, count):
+        names = ["Bag of holding", "Cloak of elvenkind", "Wand of web", "Winged boots"]
+        rarities = ["common", "uncommon", "rare"]
+        return [SimpleNamespace(name=rng.choice(names), rarity=rng.choice(rarities)) for _ in range(count)]
+
+    def test_first_match_removed(self):
+        """The earliest matching item is removed, and only once per trade"""
+        [first, second, other] = [
+            SimpleNamespace(name="Wand of web", rarity="uncommon"),
+            SimpleNamespace(name="Wand of web", rarity="uncommon"),
+            SimpleNamespace(name="Wand of web", rarity="rare"),
+        ]
+        traded = [SimpleNamespace(name="Wand of web", rarity="uncommon")]
+        self.assertEqual(remove_traded_items([first, other, second], traded), [other, second])
+
+    def test_matches_reference_behaviour(self):
+        """Randomly generated gains and trades give the same result as the original implementation"""
+        rng = random.Random(20240601)
+        for _ in range(500):
+            gained = self.make_items(rng, rng.randint(0, 30))
+            traded = self.make_items(rng, rng.randint(0, 30))
+            expected = remove_traded_items_reference(gained, traded)
+            self.assertEqual([id(item) for item in remove_traded_items(gained, traded)], [id(i) for i in expected])
+
+
+class ALLItemImportTest(TestCase):
+    """Tests for creating imported items from existing item details"""
+
+    fixtures = ["test_users", "test_characters", "test_magic_items"]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_names_resolved_in_one_query(self):
+        """All distinct names are looked up together, case insensitively, and then served from the cache"""
+        with self.assertNumQueries(1):
+            found = get_canonical_items(["lantern of revealing", "HAT OF FROGS", "Hat of frogs", "Unknown item"])
+        self.assertEqual(found["LANTERN OF REVEALING"]["description"], "This finds secret things")
+        self.assertEqual(found["HAT OF FROGS"]["rarity"], "veryrare")
+        self.assertIsNone(found["UNKNOWN ITEM"])
+
+        with self.assertNumQueries(0):
+            get_canonical_items(["Lantern of Revealing", "Hat of Frogs"])
+
+    def test_unknown_names_not_cached(self):
+        """A name without any items is looked up again, so items added later are found"""
+        get_canonical_items(["Unknown item"])
+        self.assertIsNone(cache.get(get_canonical_item_cache_key("Unknown item")))
+
+        MagicItem.objects.create(character=Character.objects.get(pk=1), name="Unknown Item", rarity="legendary")
+        with self.assertNumQueries(1):
+            found = get_canonical_items(["Unknown item"])
+        self.assertEqual(found["UNKNOWN ITEM"]["rarity"], "legendary")
+
+    def test_cache_entry_forgotten_when_items_change(self):
+        """Editing or deleting a magic item means the cached details for its name are read again"""
+        get_canonical_items(["Hat of Frogs", "Lantern of Revealing"])
+        item = MagicItem.objects.filter(name__iexact="Hat of Frogs").order_by("pk").first()
+        item.description = "Ribbit"
+        item.save()
+        self.assertIsNotNone(cache.get(get_canonical_item_cache_key("Lantern of Revealing")))
+        self.assertEqual(get_canonical_items(["Hat of Frogs"])["HAT OF FROGS"]["description"], "Ribbit")
+
+        get_canonical_items(["Hat of Frogs"])
+        item.delete()
+        self.assertIsNone(cache.get(get_canonical_item_cache_key("Hat of Frogs")))
+
+    def test_cache_shared(self):
+        """Details are kept in the shared cache with a timeout, so other processes see them and edits expire"""
+        with mock.patch.object(cache, "set_many", wraps=cache.set_many) as set_many:
+            get_canonical_items(["Winged boots"])
+        self.assertEqual(set_many.call_args.args[1], items.CANONICAL_ITEM_CACHE_TTL)
+        self.assertEqual(cache.get(get_canonical_item_cache_key("WINGED BOOTS"))["rarity"], "uncommon")
+
+    def test_create_items(self):
+        """Imported items borrow details from existing items with the same name"""
+        character = Character.objects.get(pk=1)
+        events = parse_events(
+            csv.reader(["MAGIC ITEM,lantern of revealing,common,,,,", "MAGIC ITEM,Mystery box,rare,,,,"])
+        )
+
+        with self.assertNumQueries(2):
+            created = create_msc_items(events, character)
+        self.assertEqual([item.rarity for item in created], ["uncommon", "rare"])
+        self.assertEqual(created[0].description, "This finds secret things")
+        self.assertEqual(created[1].description, "")
@@ -1,6 +1,9 @@
+import time
+
 from django.test import TestCase
 
 from codex.imports.csv import parse_classes
+from codex.imports.parse_classes import parse_classes_cached
 
 
 class CSVImportParserTest(TestCase):
@@ -23,3 +26,30 @@ class CSVImportParserTest(TestCase):
         classes = parse_classes("Paladin / 5 Sorcerer (Wild magic)")
         self.assertEqual(classes[1], test_class_1)
         self.assertEqual(classes[0], test_class_2)
+
+    def test_parse_classes_barbarian_and_bard(self):
+        self.assertEqual(parse_classes("Barbarian 3"), [{"name": "Barbarian", "subclass": "", "value": 3}])
+        self.assertEqual(parse_classes("Bard (Lore) 4"), [{"name": "Bard", "subclass": "Lore", "value": 4}])
+
+    def test_parse_classes_returns_copies(self):
+        classes = parse_classes("Wizard 5 / Fighter 2")
+        classes[0]["value"] = 20
+        self.assertEqual(parse_classes("Wizard 5 / Fighter 2")[0]["value"], 5)
+
+    def test_parse_classes_benchmark(self):
+        # Every string is different and they all fit in the cache, so the first pass parses each of them once
+        class_strings = [f"Wizard (Bladesinger) {i} / Fighter {i % 3}" for i in range(1000)]
+
+        parse_classes_cached.cache_clear()
+        start = time.perf_counter()
+        for data in class_strings:
+            parse_classes(data)
+        uncached = time.perf_counter() - start
+        self.assertLess(uncached, 2, f"{len(class_strings) / uncached:.0f} strings/s")
+        self.assertEqual(parse_classes_cached.cache_info().misses, len(class_strings))
+        self.assertEqual(parse_classes_cached.cache_info().hits, 0)
+
+        for data in class_strings:
+            parse_classes(data)
+        self.assertEqual(parse_classes_cached.cache_info().misses, len(class_strings))
+        self.assertEqual(parse_classes_cached.cache_info().hits, len(class_strings))
@@ -1,7 +1,10 @@
+from django.core.cache import cache
 from django.test import TestCase
 
 from codex.models import APIKey
+from codex.models.api_keys import hash_key
 from codex.models.users import CodexUser
+from codex.utils.api_keys import is_valid_api_key, get_api_key_cache_key
 
 
 class TestAPIKeyModel(TestCase):
@@ -35,3 +38,48 @@ class TestAPIKeyModel(TestCase):
         self.assertIn(apikey.name, string_rep)
         self.assertNotIn(apikey.value, string_rep)
         self.assertNotIn(str(apikey.uuid), string_rep)
+
+    def test_apikey_stored_hashed(self) -> None:
+        """ Only the hash and the start of a key are kept in the database """
+        user = CodexUser.objects.get(pk=1)
+        apikey = APIKey.objects.create(name='Test key', user=user)
+        key = apikey.value
+
+        stored = APIKey.objects.get(pk=apikey.pk)
+        self.assertEqual(stored.hashed_value, hash_key(key))
+        self.assertEqual(stored.value, key[:8] + '...')
+
+        stored.name = 'Renamed key'
+        stored.save()
+        stored.refresh_from_db()
+        self.assertEqual(stored.hashed_value, hash_key(key))
+
+    def test_apikey_validation_cached(self) -> None:
+        """ A validated key is answered from the shared cache until it changes """
+        user = CodexUser.objects.get(pk=1)
+        key = APIKey.objects.create(name='Test key', user=user).value
+
+        with self.assertNumQueries(1):
+            self.assertTrue(is_valid_api_key(key))
+        with self.assertNumQueries(0):
+            self.assertTrue(is_valid_api_key(key))
+
+        self.assertTrue(cache.get(get_api_key_cache_key(hash_key(key))))
+
+        APIKey.objects.get(hashed_value=hash_key(key)).delete()
+        self.assertIsNone(cache.get(get_api_key_cache_key(hash_key(key))))
+        self.assertFalse(is_valid_api_key(key))
+        self.assertFalse(is_valid_api_key(key[:8] + '...'))
+        self.assertFalse(is_valid_api_key(''))
+
+    def test_apikey_replaced_value_forgotten(self) -> None:
+        """ A key stops working as soon as its value is replaced, even if it was cached """
+        user = CodexUser.objects.get(pk=1)
+        apikey = APIKey.objects.create(name='Test key', user=user)
+        old_key = apikey.value
+        self.assertTrue(is_valid_api_key(old_key))
+
+        apikey.value = 'x' * 64
+        apikey.save()
+        self.assertFalse(is_valid_api_key(old_key))
+        self.assertTrue(is_valid_api_key('x' * 64))
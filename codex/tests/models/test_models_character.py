@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from codex.models.character import Character
+
+
+class TestCharacterModel(TestCase):
+    """Tests for character level calculation and narrow saves"""
+
+    fixtures = ["test_users", "test_characters"]
+
+    def test_calculate_level(self) -> None:
+        """Levels are totalled across classes, invalid class data gives level 1"""
+        self.assertEqual(
+            Character.calculate_level([{"name": "Wizard", "value": 5}, {"name": "Fighter", "value": 2}]), 7
+        )
+        self.assertEqual(Character.calculate_level([]), 1)
+        self.assertEqual(Character.calculate_level({"name": "Wizard", "value": 5}), 1)
+        self.assertEqual(Character.calculate_level([{"name": "Wizard", "value": "5"}]), 1)
+        self.assertEqual(Character.calculate_level([{"name": "Wizard"}]), 1)
+        self.assertEqual(Character.calculate_level(["Wizard 5"]), 1)
+
+    def test_level_recalculated_when_classes_change(self) -> None:
+        """Changing classes updates the level"""
+        character = Character.objects.get(pk=1)
+        character.classes = [{"name": "Wizard", "subclass": "", "value": 11}]
+        character.save()
+
+        character.refresh_from_db()
+        self.assertEqual(character.level, 11)
+
+    def test_level_recalculated_when_single_class_given(self) -> None:
+        """A single class object is coerced to a list and counted"""
+        character = Character.objects.get(pk=1)
+        character.classes = {"name": "Wizard", "subclass": "", "value": 4}
+        character.save(update_fields=["classes"])
+
+        character.refresh_from_db()
+        self.assertEqual(character.classes, [{"name": "Wizard", "subclass": "", "value": 4}])
+        self.assertEqual(character.level, 4)
+
+    def test_classes_not_parsed_when_unchanged(self) -> None:
+        """Saving a character without touching its classes leaves the level alone"""
+        # A level that doesn't match the classes would be overwritten if the classes were parsed again
+        Character.objects.filter(pk=1).update(level=12)
+        character = Character.objects.get(pk=1)
+        character.name = "Meepo the Great"
+        character.save()
+
+        character.refresh_from_db()
+        self.assertEqual(character.level, 12)
+
+    def test_reward_save_is_narrow(self) -> None:
+        """Saving only gold and downtime should not rewrite the rest of the row"""
+        character = Character.objects.get(pk=1)
+        character.gold += 100
+        character.downtime += 5
+
+        with CaptureQueriesContext(connection) as context:
+            character.save(update_fields=["gold", "downtime"])
+        update = [query["sql"] for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(update), 1)
+        self.assertIn('"gold"', update[0])
+        self.assertNotIn('"biography"', update[0])
+        self.assertNotIn('"classes"', update[0])
+
+        character.refresh_from_db()
+        self.assertEqual(character.gold, 523.1)
+        self.assertEqual(character.downtime, 15)
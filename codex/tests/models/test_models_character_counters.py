@@ -0,0 +1,123 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from codex.models.character import Character
+from codex.models.items import MagicItem
+from codex.models.events import Game
+from codex.models.events_downtime import FreeForm, SpellbookUpdate
+
+
+class TestCharacterCounters(TestCase):
+    """Tests for the denormalised character item, game and event counters"""
+
+    fixtures = ["test_users", "test_characters", "test_magic_items", "test_character_games"]
+
+    def assertCounts(self, character, items, games, events):
+        character.refresh_from_db()
+        self.assertEqual((character.item_count, character.game_count, character.event_count), (items, games, events))
+
+    def test_fixture_counts(self) -> None:
+        """Counts should match the data loaded for a character"""
+        character = Character.objects.get(pk=1)
+        self.assertCounts(
+            character,
+            character.magicitems.count(),
+            character.games.count(),
+            0,
+        )
+
+    def test_item_counts(self) -> None:
+        """Creating and deleting items updates the count"""
+        character = Character.objects.create(name="Counter")
+        item = MagicItem.objects.create(character=character, name="Bag of holding")
+        MagicItem.objects.create(character=character, name="Cloak of elvenkind")
+        self.assertCounts(character, 2, 0, 0)
+
+        item.delete()
+        self.assertCounts(character, 1, 0, 0)
+
+    def test_game_counts(self) -> None:
+        """Joining and leaving games updates the count from either side of the relationship"""
+        character = Character.objects.create(name="Counter")
+        game = Game.objects.create(module="DDAL00-01")
+        other_game = Game.objects.create(module="DDAL00-02")
+
+        game.characters.add(character)
+        character.games.add(other_game)
+        self.assertCounts(character, 0, 2, 0)
+
+        game.characters.remove(character)
+        self.assertCounts(character, 0, 1, 0)
+        other_game.characters.clear()
+        self.assertCounts(character, 0, 0, 0)
+
+    def test_event_counts(self) -> None:
+        """Freeform and spellbook update events are both counted"""
+        character = Character.objects.create(name="Counter")
+        freeform = FreeForm.objects.create(character=character, title="Carousing")
+        SpellbookUpdate.objects.create(character=character, spells="Fireball")
+        self.assertCounts(character, 0, 0, 2)
+
+        freeform.delete()
+        self.assertCounts(character, 0, 0, 1)
+
+    def test_save_does_not_overwrite_counts(self) -> None:
+        """Saving a stale copy of a character must not reset its counters"""
+        character = Character.objects.create(name="Counter")
+        stale = Character.objects.get(pk=character.pk)
+        MagicItem.objects.create(character=character, name="Bag of holding")
+
+        stale.name = "Renamed"
+        stale.save()
+        self.assertEqual(stale.item_count, 1)
+        self.assertCounts(character, 1, 0, 0)
+
+    def test_rebuild_command(self) -> None:
+        """The management command detects and repairs incorrect counters"""
+        character = Character.objects.get(pk=1)
+        Character.objects.filter(pk=character.pk).update(item_count=999, game_count=999)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_character_counters", "--verify", stdout=StringIO())
+
+        output = StringIO()
+        call_command("rebuild_character_counters", stdout=output)
+        self.assertIn("Rebuilt counters for 1 characters", output.getvalue())
+        self.assertCounts(character, character.magicitems.count(), character.games.count(), 0)
+
+        output = StringIO()
+        call_command("rebuild_character_counters", "--verify", stdout=output)
+        self.assertIn("correct", output.getvalue())
+
+    def test_deleting_character_skips_item_signals(self) -> None:
+        """Items removed along with their character don't each update the character being deleted"""
+        character = Character.objects.create(name="Counter")
+        MagicItem.objects.bulk_create(MagicItem(character=character, name=f"Item {i}") for i in range(100))
+        FreeForm.objects.bulk_create(FreeForm(character=character, title=f"Event {i}") for i in range(10))
+
+        with CaptureQueriesContext(connection) as context:
+            character.delete()
+        updates = [
+            query["sql"] for query in context.captured_queries if query["sql"].startswith('UPDATE "codex_character"')
+        ]
+        self.assertEqual(updates, [])
+        # the character's removed event markers are one more table to clear, but nothing is recorded for its events
+        self.assertFalse([query for query in context.captured_queries if query["sql"].startswith("INSERT")])
+        self.assertLess(len(context.captured_queries), 21)
+
+    def test_save_reads_counters_lazily(self) -> None:
+        """Saving doesn't read the counters back, they are loaded together the first time one is used"""
+        character = Character.objects.get(pk=1)
+        character.name = "Renamed"
+        with self.assertNumQueries(1):
+            character.save()
+
+        expected = Character.objects.values_list("item_count", "game_count", "event_count").get(pk=1)
+        with self.assertNumQueries(1):
+            self.assertEqual((character.item_count, character.game_count, character.event_count), expected)
+            self.assertIsInstance(character.version, int)
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from codex.models.character import Character
+from codex.utils.character import update_character_rewards
+
+
+class TestCharacterRewards(TestCase):
+    """Tests for applying gold and downtime changes in the database"""
+
+    fixtures = ["test_users", "test_characters"]
+
+    def test_rewards_applied(self) -> None:
+        """Gold and downtime are added in a single UPDATE and the instance is refreshed"""
+        character = Character.objects.get(pk=1)
+        with CaptureQueriesContext(connection) as context:
+            update_character_rewards(character, gold=100, downtime=5)
+        updates = [query["sql"] for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(character.gold, 523.1)
+        self.assertEqual(character.downtime, 15)
+
+    def test_stale_instances_do_not_lose_updates(self) -> None:
+        """Two copies of the same character loaded before either change both apply"""
+        first = Character.objects.get(pk=1)
+        second = Character.objects.get(pk=1)
+
+        update_character_rewards(first, gold=100)
+        update_character_rewards(second, gold=50, downtime=-2)
+
+        character = Character.objects.get(pk=1)
+        self.assertEqual(character.gold, 573.1)
+        self.assertEqual(character.downtime, 8)
+        self.assertEqual(second.gold, character.gold)
+
+    def test_insufficient_balance_refused(self) -> None:
+        """A deduction larger than the balance is refused and nothing is changed"""
+        character = Character.objects.get(pk=1)
+        version = character.version
+
+        with self.assertRaisesMessage(ValueError, "Insufficient gold"):
+            update_character_rewards(character, gold=-1000, downtime=-1)
+        with self.assertRaisesMessage(ValueError, "Insufficient downtime"):
+            update_character_rewards(character, gold=-1, downtime=-11)
+
+        character.refresh_from_db()
+        self.assertEqual((character.gold, character.downtime, character.version), (423.1, 10, version))
+
+    def test_exact_balance_spent(self) -> None:
+        """A character can spend everything they have"""
+        character = Character.objects.get(pk=1)
+        update_character_rewards(character, gold=-423.1, downtime=-10)
+        self.assertEqual((character.gold, character.downtime), (0, 0))
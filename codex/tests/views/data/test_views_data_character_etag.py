@@ -0,0 +1,86 @@
+from rest_framework.status import *
+from django.test import TestCase
+from django.urls import reverse
+
+from codex.models.character import Character
+from codex.models.items import MagicItem, Consumable
+from codex.models.events_downtime import FreeForm, SpellbookUpdate
+from codex.tests.test_utils import reverse_querystring
+
+
+class TestCharacterConditionalViews(TestCase):
+    """Check ETag handling on character reads"""
+
+    fixtures = ["test_users", "test_characters", "test_magic_items", "test_consumable_items"]
+
+    def get_character(self, character, **headers):
+        return self.client.get(reverse("character-detail", kwargs={"uuid": character.uuid}), headers=headers)
+
+    def assertModified(self, character, etag):
+        response = self.get_character(character, **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        return response.headers["ETag"]
+
+    def test_etag_returned(self) -> None:
+        """A character read includes an entity tag"""
+        response = self.get_character(Character.objects.get(pk=1))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertIn("ETag", response.headers)
+
+    def test_unchanged_character_not_modified(self) -> None:
+        """Presenting the current tag skips the inventories and the payload"""
+        character = Character.objects.get(pk=1)
+        etag = self.get_character(character).headers["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.get_character(character, **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertFalse(response.content)
+
+    def test_character_change_invalidates_etag(self) -> None:
+        """Saving the character produces a new tag"""
+        character = Character.objects.get(pk=1)
+        etag = self.get_character(character).headers["ETag"]
+
+        character.name = "Meepo the Great"
+        character.save()
+        self.assertModified(character, etag)
+
+    def test_inventory_changes_invalidate_etag(self) -> None:
+        """Creating, editing or removing items produces a new tag"""
+        character = Character.objects.get(pk=1)
+        etag = self.get_character(character).headers["ETag"]
+
+        item = MagicItem.objects.create(character=character, name="Bag of holding")
+        etag = self.assertModified(character, etag)
+        item.name = "Bag of tricks"
+        item.save()
+        etag = self.assertModified(character, etag)
+        item.delete()
+        etag = self.assertModified(character, etag)
+        Consumable.objects.create(character=character, name="Potion of healing")
+        self.assertModified(character, etag)
+
+    def test_downtime_events_invalidate_etag(self) -> None:
+        """Logging downtime activities produces a new tag"""
+        character = Character.objects.get(pk=1)
+        etag = self.get_character(character).headers["ETag"]
+
+        FreeForm.objects.create(character=character, title="Carousing")
+        etag = self.assertModified(character, etag)
+        SpellbookUpdate.objects.create(character=character, spells="Fireball")
+        self.assertModified(character, etag)
+
+    def test_etag_varies_with_representation(self) -> None:
+        """A sparse fieldset has a different tag to the full representation"""
+        character = Character.objects.get(pk=1)
+        etag = self.get_character(character).headers["ETag"]
+
+        response = self.client.get(
+            reverse_querystring("character-detail", kwargs={"uuid": character.uuid}, query_kwargs={"fields": "name"}),
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
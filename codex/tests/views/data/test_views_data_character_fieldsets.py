@@ -0,0 +1,98 @@
+from rest_framework.status import *
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.models.items import MagicItem, Consumable
+from codex.tests.test_utils import reverse_querystring
+
+
+class TestCharacterFieldsetViews(TestCase):
+    """Check character summaries and sparse fieldsets"""
+
+    fixtures = ["test_users", "test_characters", "test_magic_items", "test_consumable_items"]
+
+    def setUp(self) -> None:
+        self.client.force_login(CodexUser.objects.get(username="testuser1"))
+
+    def test_summary_excludes_large_fields(self) -> None:
+        """The summary representation should not contain biographies or inventories"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse_querystring("character-summary"))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        character = response.data["results"][0]
+        for key in ["uuid", "name", "level", "classes"]:
+            self.assertIn(key, character)
+        for key in ["biography", "dm_text", "items", "consumables"]:
+            self.assertNotIn(key, character)
+        self.assertNotIn("biography", " ".join(query["sql"] for query in context.captured_queries))
+
+    def test_summary_requires_login(self) -> None:
+        """Anonymous users have no roster to summarise"""
+        self.client.logout()
+        response = self.client.get(reverse_querystring("character-summary"))
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_list_sparse_fields(self) -> None:
+        """Only requested fields should be returned or selected, uuid is always included"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse_querystring("character-list", query_kwargs={"fields": "name,level"}))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"uuid", "name", "level"})
+        queries = " ".join(query["sql"] for query in context.captured_queries)
+        self.assertNotIn("biography", queries)
+        self.assertNotIn("codex_magicitem", queries)
+
+    def test_list_sparse_fields_with_expansion(self) -> None:
+        """Inventories are only loaded when expanded"""
+        query = {"fields": "name,editable", "expand": "items"}
+        response = self.client.get(reverse_querystring("character-list", query_kwargs=query))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        character = response.data["results"][0]
+        self.assertEqual(set(character), {"uuid", "name", "editable", "items"})
+        self.assertTrue(character["editable"])
+        self.assertGreater(len(character["items"]), 0)
+
+    def test_expand_without_fields(self) -> None:
+        """Expanding without a field list returns every field but only the requested inventories"""
+        response = self.client.get(reverse_querystring("character-list", query_kwargs={"expand": "consumables"}))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        character = response.data["results"][0]
+        self.assertIn("biography", character)
+        self.assertIn("consumables", character)
+        self.assertNotIn("items", character)
+
+    def test_retrieve_sparse_fields(self) -> None:
+        """Sparse fieldsets also apply to a single character"""
+        character = Character.objects.get(pk=1)
+        self.client.logout()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse_querystring(
+                    "character-detail", kwargs={"uuid": character.uuid}, query_kwargs={"fields": "name"}
+                )
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data, {"uuid": str(character.uuid), "name": character.name})
+
+    def test_list_sparse_fields_with_expansion_query_count(self) -> None:
+        """Expanded inventories need the owner's name and player, which must not be loaded per character"""
+        user = CodexUser.objects.get(username="testuser1")
+        for i in range(10):
+            character = Character.objects.create(name=f"Extra {i}", player=user)
+            MagicItem.objects.create(character=character, name="Bag of holding")
+            Consumable.objects.create(character=character, name="Potion of healing")
+
+        query = {"fields": "level", "expand": "items,consumables"}
+        # session, user, count, characters and one query for each inventory
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse_querystring("character-list", query_kwargs=query))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data["count"], 12)
+        character = response.data["results"][-1]
+        self.assertEqual(set(character), {"uuid", "level", "items", "consumables"})
+        self.assertEqual(character["items"][0]["owner_name"], "Extra 9")
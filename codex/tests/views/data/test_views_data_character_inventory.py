@@ -0,0 +1,49 @@
+from rest_framework.status import *
+from django.test import TestCase
+from django.urls import reverse
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.models.items import MagicItem, Consumable
+from codex.serialisers.characters import CharacterDetailsSerialiser
+from codex.utils.character import load_character_inventories
+
+
+class TestCharacterInventoryLoading(TestCase):
+    """Check that characters are serialised with their inventories in a fixed number of queries"""
+
+    fixtures = ["test_users", "test_characters", "test_magic_items", "test_consumable_items"]
+
+    def add_items(self, character, count):
+        for i in range(count):
+            MagicItem.objects.create(character=character, name=f"Extra item {i}")
+            Consumable.objects.create(character=character, name=f"Extra potion {i}")
+
+    def test_batch_serialised_in_three_queries(self) -> None:
+        """One query each for the characters, their magic items and their consumables"""
+        user = CodexUser.objects.get(username="testuser1")
+        for character in Character.objects.filter(player=user):
+            self.add_items(character, 10)
+
+        with self.assertNumQueries(3):
+            characters = load_character_inventories(Character.objects.filter(player=user))
+            data = CharacterDetailsSerialiser(characters, many=True, context={"user": user}).data
+
+        self.assertEqual(len(data), 2)
+        for character in data:
+            self.assertTrue(character["editable"])
+            for item in character["items"] + character["consumables"]:
+                self.assertEqual(item["owner_name"], character["name"])
+                self.assertEqual(str(item["owner_uuid"]), character["uuid"])
+                self.assertTrue(item["editable"])
+
+    def test_retrieve_query_count_independent_of_inventory(self) -> None:
+        """Retrieving a single character should not issue a query per item"""
+        character = Character.objects.get(pk=1)
+        self.add_items(character, 25)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("character-detail", kwargs={"uuid": character.uuid}))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertGreaterEqual(len(response.data["items"]), 25)
+        self.assertFalse(response.data["items"][0]["editable"])
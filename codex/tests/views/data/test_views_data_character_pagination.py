@@ -0,0 +1,58 @@
+from rest_framework.status import *
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.models.items import MagicItem, Consumable
+from codex.tests.test_utils import reverse_querystring
+
+
+class TestCharacterPaginationViews(TestCase):
+    """Check that character list pages cost the same regardless of roster size"""
+
+    fixtures = ["test_users"]
+
+    def create_roster(self, user, size, items=3):
+        """Give the user a number of characters, each with a small inventory"""
+        for i in range(size):
+            character = Character.objects.create(player=user, name=f"Roster character {i}")
+            for j in range(items):
+                MagicItem.objects.create(character=character, name=f"Item {j}")
+                Consumable.objects.create(character=character, name=f"Potion {j}")
+
+    def count_page_queries(self, limit=5):
+        """Fetch a single page of characters and return the number of queries used"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse_querystring("character-list", query_kwargs={"limit": limit}))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertLessEqual(len(response.data["results"]), limit)
+        return len(context.captured_queries)
+
+    def test_page_contains_only_requested_characters(self) -> None:
+        """Only the characters on the requested page should be returned"""
+        user = CodexUser.objects.get(username="testuser3")
+        self.client.force_login(user)
+        self.create_roster(user, 12)
+
+        response = self.client.get(reverse_querystring("character-list", query_kwargs={"limit": 5, "offset": 10}))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(response.data["results"][0]["name"], "Roster character 10")
+        self.assertEqual(len(response.data["results"][0]["items"]), 3)
+        self.assertEqual(len(response.data["results"][0]["consumables"]), 3)
+        self.assertTrue(response.data["results"][0]["items"][0]["editable"])
+
+    def test_page_query_count_flat_as_roster_grows(self) -> None:
+        """A page of characters should cost a fixed number of queries however many characters exist"""
+        user = CodexUser.objects.get(username="testuser3")
+        self.client.force_login(user)
+
+        self.create_roster(user, 5)
+        small_roster = self.count_page_queries()
+        self.create_roster(user, 40, items=8)
+        large_roster = self.count_page_queries()
+
+        self.assertEqual(small_roster, large_roster)
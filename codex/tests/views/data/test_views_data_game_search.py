@@ -1,9 +1,15 @@
 from copy import copy
+from datetime import date, datetime, timezone
+from unittest import skipUnless
 
 from rest_framework.status import *
+from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
 
+from codex.models.events import Game
+from codex.views.events.games_search import SearchGamesView
+
 
 class TestGameSearchView(TestCase):
     fixtures = ["test_users", "test_dungeonmaster_games"]
@@ -23,10 +29,11 @@ class TestGameSearchView(TestCase):
 
         response = self.client.post(reverse("game_search"), self.valid_data)
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 1)
-        self.assertIn("uuid", response.data[0])
-        self.assertIn("name", response.data[0])
+        self.assertEqual(response.data["count"], 1)
+        self.assertIsInstance(response.data["results"], list)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIn("uuid", response.data["results"][0])
+        self.assertIn("name", response.data["results"][0])
 
     def test_game_search_narrow(self) -> None:
         """Ensure the game search is narrow - no fishing trips"""
@@ -36,3 +43,67 @@ class TestGameSearchView(TestCase):
 
         response = self.client.post(reverse("game_search"), test_data)
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def search(self, **data):
+        response = self.client.post(reverse("game_search"), data)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        return [game["module"] for game in response.data["results"]]
+
+    def test_game_search_module_prefix(self) -> None:
+        """Module codes are matched case insensitively by prefix, with an exact match ranked first"""
+        self.client.login(username="testuser1", password="testpassword")
+        Game.objects.create(module="DDAL0002", datetime=datetime(2022, 5, 29, 18, tzinfo=timezone.utc))
+
+        self.assertEqual(self.search(module="ddal0002", datetime="2022-05-29"), ["DDAL0002", "DDAL0002A", "DDAL0002B"])
+        self.assertEqual(self.search(module="ddal0002a", datetime="2022-05-29"), ["DDAL0002A"])
+        self.assertEqual(self.search(module="0002", datetime="2022-05-29"), [])
+
+    def test_game_search_text(self) -> None:
+        """Search text is matched against the module code and name, DM name and location"""
+        self.client.login(username="testuser1", password="testpassword")
+
+        self.assertEqual(self.search(search="site", datetime="2022-05-29"), ["DDAL0002B"])
+        self.assertEqual(self.search(search="lost tales", datetime="2022-05-29"), ["DDAL0002A", "DDAL0002B"])
+        self.assertEqual(self.search(search="foundry", datetime="2022-05-29"), ["DDAL0002A", "DDAL0002B"])
+        self.assertEqual(self.search(search="roll20", datetime="2022-05-29"), [])
+
+    def test_game_search_date_range(self) -> None:
+        """Date ranges include the whole of both the start and end days"""
+        self.client.login(username="testuser1", password="testpassword")
+        Game.objects.create(module="DDAL0002C", datetime=datetime(2022, 5, 31, 23, 59, tzinfo=timezone.utc))
+        Game.objects.create(module="DDAL0002D", datetime=datetime(2022, 6, 1, tzinfo=timezone.utc))
+
+        modules = self.search(module="DDAL0002", start="2022-05-29", end="2022-05-31")
+        self.assertEqual(modules, ["DDAL0002A", "DDAL0002B", "DDAL0002C"])
+        self.assertEqual(self.search(module="DDAL0002", datetime="2022-06-01"), ["DDAL0002D"])
+
+    def test_game_search_paginated(self) -> None:
+        """Search results are paged"""
+        self.client.login(username="testuser1", password="testpassword")
+
+        response = self.client.post(reverse("game_search") + "?limit=1", {"module": "DDAL", "datetime": "2022-05-29"})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_game_search_invalid_dates(self) -> None:
+        """Searches with a malformed or reversed date range are refused"""
+        self.client.login(username="testuser1", password="testpassword")
+
+        response = self.client.post(reverse("game_search"), {"module": "DDAL", "datetime": "yesterday"})
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            reverse("game_search"), {"module": "DDAL", "start": "2022-06-01", "end": "2022-05-01"}
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    @skipUnless(connection.vendor == "sqlite", "Query plans are database specific")
+    def test_game_search_uses_indexes(self) -> None:
+        """Prefix searches are answered from an index rather than by scanning every game"""
+        day = date(2022, 5, 29)
+
+        plan = SearchGamesView().search("DDAL", None, day, day).explain()
+        self.assertIn("USING INDEX game_module_upper_idx", plan)
+        plan = SearchGamesView().search(None, "Foundry", day, day).explain()
+        self.assertNotIn("SCAN codex_game", plan)
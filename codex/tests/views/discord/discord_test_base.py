@@ -2,10 +2,20 @@ from rest_framework.status import *
 from django.test import TestCase
 from django.urls import reverse
 
+from codex.models.api_keys import hash_key
+from codex.utils.api_keys import forget_api_key
+
+# The key stored hashed in the test_apikeys fixture
+TEST_APIKEY = "qi3jONF2gk0uchwNTw6sD5kHhlHr33mF5QeVeHsUJxePjIDY90pvN0RIs1pTy4SP"
+
 
 class DiscordBaseTest(TestCase):
     """Tests for DiscordBot API functionality"""
 
+    def setUp(self) -> None:
+        # Keys are fixtures restored by rolling back, which doesn't send the signals that clear the cache
+        forget_api_key(hash_key(TEST_APIKEY))
+
     def test_apikey_required(self) -> None:
         """Any query to the discord bot endpoint needs to include an apikey"""
         self.client.logout()
@@ -1,11 +1,14 @@
+import json
+
 from rest_framework.status import *
 from django.urls import reverse
 
-from codex.models.api_keys import APIKey
 from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.views.discord.characters import MAX_DISCORD_IDS
 
 
-from codex.tests.views.discord.discord_test_base import DiscordBaseTest
+from codex.tests.views.discord.discord_test_base import DiscordBaseTest, TEST_APIKEY
 
 
 class TestDiscordBotCharacterSearch(DiscordBaseTest):
@@ -15,10 +18,9 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
 
     def test_search_by_valid_discord_id(self) -> None:
         """Check that a discord ID for a player brings back their public characters"""
-        apikey = APIKey.objects.get(pk=1)
         user = CodexUser.objects.get(username="testuser1")
 
-        test_data = {"apikey": apikey.value, "discord_id": user.discord_id.lower()}
+        test_data = {"apikey": TEST_APIKEY, "discord_id": user.discord_id.lower()}
         response = self.client.post(reverse("discord_characters_list"), test_data)
         self.assertEqual(response.status_code, HTTP_200_OK)
         self.assertIsInstance(response.data, list)
@@ -28,10 +30,9 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
 
     def test_search_by_invalid_discord_id(self) -> None:
         """Check that a discord ID for a player brings back their public characters"""
-        apikey = APIKey.objects.get(pk=1)
         user = CodexUser.objects.get(username="testuser1")
 
-        test_data = {"apikey": apikey.value, "discord_id": "DrizztGod#0001"}
+        test_data = {"apikey": TEST_APIKEY, "discord_id": "DrizztGod#0001"}
         response = self.client.post(reverse("discord_characters_list"), test_data)
         self.assertEqual(response.status_code, HTTP_200_OK)
         self.assertIsInstance(response.data, list)
@@ -39,15 +40,65 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
 
     def test_search_by_discord_id_with_space(self) -> None:
         """Check that a discord ID for a player brings back their public characters"""
-        apikey = APIKey.objects.get(pk=1)
         user = CodexUser.objects.get(username="testuser1")
         user.discord_id = "Volothamp Gedarm#1337"
         user.save()
 
-        test_data = {"apikey": apikey.value, "discord_id": user.discord_id}
+        test_data = {"apikey": TEST_APIKEY, "discord_id": user.discord_id}
         response = self.client.post(reverse("discord_characters_list"), test_data)
         self.assertEqual(response.status_code, HTTP_200_OK)
         self.assertIsInstance(response.data, list)
         self.assertGreaterEqual(len(response.data), 2)
         self.assertIn("name", response.data[0])
         self.assertEqual("Meepo", response.data[0]["name"])
+
+    def test_batch_lookup_by_discord_ids(self) -> None:
+        """A list of discord IDs brings back each player's public characters keyed by the IDs given"""
+        Character.objects.filter(name="Meesha").update(public=True)
+        test_data = {"apikey": TEST_APIKEY, "discord_ids": ["volothamp#0420", "TestUser#1111", "DrizztGod#0001"]}
+
+        # API key, characters and one query for each inventory however many IDs are given
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                reverse("discord_characters_list"), json.dumps(test_data), content_type="application/json"
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(list(response.data), test_data["discord_ids"])
+        self.assertEqual([c["name"] for c in response.data["volothamp#0420"]], ["Meepo", "Meela"])
+        self.assertEqual([c["name"] for c in response.data["TestUser#1111"]], ["Meesha"])
+        self.assertEqual(response.data["DrizztGod#0001"], [])
+        self.assertIn("items", response.data["volothamp#0420"][0])
+
+    def test_batch_lookup_summary(self) -> None:
+        """Summary lookups leave out inventories and don't load them"""
+        test_data = {"apikey": TEST_APIKEY, "discord_ids": ["Volothamp#0420"], "summary": True}
+
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                reverse("discord_characters_list"), json.dumps(test_data), content_type="application/json"
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        characters = response.data["Volothamp#0420"]
+        self.assertEqual(len(characters), 2)
+        self.assertIn("level", characters[0])
+        self.assertNotIn("items", characters[0])
+        self.assertNotIn("biography", characters[0])
+
+    def test_batch_lookup_form_data(self) -> None:
+        """Discord IDs can also be sent as repeated form fields"""
+        test_data = {"apikey": TEST_APIKEY, "discord_ids": ["Volothamp#0420", "TestUser#1111"], "summary": "true"}
+
+        response = self.client.post(reverse("discord_characters_list"), test_data)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(len(response.data["Volothamp#0420"]), 2)
+        self.assertEqual(response.data["TestUser#1111"], [])
+
+    def test_batch_lookup_validated(self) -> None:
+        """discord_ids must be a list of a limited size"""
+        for discord_ids in ["Volothamp#0420", [f"Player#{i:04d}" for i in range(MAX_DISCORD_IDS + 1)]]:
+            test_data = {"apikey": TEST_APIKEY, "discord_ids": discord_ids}
+            response = self.client.post(
+                reverse("discord_characters_list"), json.dumps(test_data), content_type="application/json"
+            )
+            self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+            self.assertIn("message", response.data)
@@ -1,16 +1,19 @@
 import json
 from copy import copy
+from datetime import datetime, timedelta, timezone
 
 from rest_framework.status import *
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 
-from codex.models.api_keys import APIKey
 from codex.models.users import CodexUser
 from codex.models.events import Game
 
 
-from codex.tests.views.discord.discord_test_base import DiscordBaseTest
+from codex.tests.views.discord.discord_test_base import DiscordBaseTest, TEST_APIKEY
 
 
 class TestDiscordBotCharacterSearch(DiscordBaseTest):
@@ -34,9 +37,8 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
 
     def test_game_create_requires_existing_user_discord_id(self) -> None:
         """A game create request for a non existant user should fail"""
-        apikey = APIKey.objects.get(pk=1)
         test_data = copy(self.valid_data)
-        test_data["apikey"] = apikey.value
+        test_data["apikey"] = TEST_APIKEY
         test_data["owner_discord_id"] = "00000000"
 
         response = self.client.post(reverse("discord_games_create"), test_data)
@@ -44,10 +46,9 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
 
     def test_game_create_ok(self) -> None:
         """A valid request should succeed"""
-        apikey = APIKey.objects.get(pk=1)
         user = CodexUser.objects.get(pk=1)
         test_data = copy(self.valid_data)
-        test_data["apikey"] = apikey.value
+        test_data["apikey"] = TEST_APIKEY
         test_data["owner_discord_id"] = user.discord_id
 
         self.assertEqual(Game.objects.all().count(), 0)
@@ -67,7 +68,6 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
 
     def test_game_duplicate_fails(self) -> None:
         """If a game with that code, DM and date already exist, don't recreate"""
-        apikey = APIKey.objects.get(pk=1)
         user = CodexUser.objects.get(pk=1)
         dm = user.dm_info.first()
 
@@ -78,7 +78,7 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
         self.assertEqual(Game.objects.all().count(), 1)
 
         test_data = copy(self.valid_data)
-        test_data["apikey"] = apikey.value
+        test_data["apikey"] = TEST_APIKEY
         test_data["owner_discord_id"] = user.discord_id
 
         response = self.client.post(
@@ -89,3 +89,37 @@ class TestDiscordBotCharacterSearch(DiscordBaseTest):
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
         self.assertIn("message", response.data)
         self.assertEqual(Game.objects.all().count(), 1)
+
+    def create_game(self, game_datetime):
+        """Post a game for user 1 at the given time"""
+        user = CodexUser.objects.get(pk=1)
+        test_data = copy(self.valid_data)
+        test_data["apikey"] = TEST_APIKEY
+        test_data["owner_discord_id"] = user.discord_id
+        test_data["datetime"] = game_datetime.timestamp()
+
+        return self.client.post(
+            reverse("discord_games_create"), json.dumps(test_data), content_type="application/json"
+        )
+
+    def test_game_duplicate_checked_by_day(self) -> None:
+        """A game at another time on the same day is a duplicate, one on the next day is not"""
+        morning = datetime(2024, 3, 9, 0, 30, tzinfo=timezone.utc)
+        self.assertEqual(self.create_game(morning).status_code, HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.create_game(morning + timedelta(hours=23))
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertFalse(any("cast_date" in query["sql"].lower() for query in context.captured_queries))
+
+        self.assertEqual(self.create_game(morning + timedelta(days=1)).status_code, HTTP_200_OK)
+        self.assertEqual(Game.objects.all().count(), 2)
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_game_duplicate_uses_configured_time_zone(self) -> None:
+        """Days run from midnight to midnight in the configured time zone rather than in UTC"""
+        evening = datetime(2024, 3, 9, 23, 0, tzinfo=timezone.utc)  # 18:00 in New York
+        self.assertEqual(self.create_game(evening).status_code, HTTP_200_OK)
+        # 04:00 UTC the next day is still 23:00 on the 9th in New York
+        self.assertEqual(self.create_game(evening + timedelta(hours=5)).status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.create_game(evening + timedelta(hours=6)).status_code, HTTP_200_OK)
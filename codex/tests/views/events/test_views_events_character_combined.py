@@ -1,8 +1,16 @@
+from unittest import skipUnless
+
 from rest_framework.status import *
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from codex.models.character import Character
+from codex.models.events import Game, RemovedEvent
+from codex.models.events_downtime import FreeForm
+from codex.tests.test_utils import reverse_querystring
+from codex.utils.timeline import get_character_timeline
 
 
 class TestCharacterEventView(TestCase):
@@ -23,10 +31,10 @@ class TestCharacterEventView(TestCase):
 
         response = self.client.get(reverse("character_events", kwargs={"character_uuid": character.uuid}))
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 3)
-        self.assertIn("event_type", response.data[0])
-        self.assertEqual(response.data[0].get("event_type"), "game")
+        self.assertIsInstance(response.data["results"], list)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIn("event_type", response.data["results"][0])
+        self.assertEqual(response.data["results"][0].get("event_type"), "game")
 
     def test_anonymous_user_missing_uuid(self) -> None:
         """An anonymous user should get an error if they don't specify a UUID"""
@@ -47,7 +55,7 @@ class TestCharacterEventView(TestCase):
 
         response = self.client.get(reverse("character_events", kwargs={"character_uuid": character.uuid}))
         self.assertEqual(response.status_code, HTTP_200_OK)
-        events = response.data
+        events = response.data["results"]
         self.assertIsInstance(events, list)
         for event in events:
             if event["event_type"] == "dt_sbookupd":
@@ -61,9 +69,197 @@ class TestCharacterEventView(TestCase):
 
         response = self.client.get(reverse("character_events", kwargs={"character_uuid": character.uuid}))
         self.assertEqual(response.status_code, HTTP_200_OK)
-        events = response.data
+        events = response.data["results"]
         self.assertIsInstance(events, list)
         for event in events:
             if event["event_type"] == "dt_freeform":
                 return None
         self.fail("Expected catching up event not returned")
+
+    def test_events_in_date_order(self) -> None:
+        """Events of every type are returned oldest first"""
+        character = Character.objects.get(pk=1)
+        game = Game.objects.create(module="DDAL00-01", datetime="2022-08-20T10:00:00Z")
+        game.characters.add(character)
+
+        response = self.client.get(reverse("character_events", kwargs={"character_uuid": character.uuid}))
+        self.assertEqual(
+            [event["event_type"] for event in response.data["results"]], ["dt_freeform", "dt_sbookupd", "game"]
+        )
+
+    def test_events_paginated(self) -> None:
+        """Pages are fetched by cursor and only the events on the page are loaded"""
+        character = Character.objects.get(pk=2)
+        for day in range(1, 11):
+            FreeForm.objects.create(character=character, title=f"Day {day}", datetime=f"2023-01-{day:02d}T10:00:00Z")
+
+        events = []
+        url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"limit": 5}
+        )
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            # character, timeline, then at most one query per event type and relation on the page
+            self.assertLessEqual(len(context.captured_queries), 7)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 5)
+            events += response.data["results"]
+            url = response.data["next"]
+
+        self.assertEqual(len(events), 13)
+        self.assertEqual([event["event_type"] for event in events[:3]], ["game", "game", "game"])
+        self.assertEqual([event["title"] for event in events[3:]], [f"Day {day}" for day in range(1, 11)])
+
+    def test_undated_events_paginated(self) -> None:
+        """Events without a date come first and can be paged through like any others"""
+        character = Character.objects.get(pk=2)
+        for i in range(4):
+            FreeForm.objects.create(character=character, title=f"Undated {i}", datetime=None)
+        game = Game.objects.create(module="DDAL00-03", datetime=None)
+        game.characters.add(character)
+
+        events = []
+        url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"limit": 2}
+        )
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+            events += response.data["results"]
+            url = response.data["next"]
+
+        self.assertEqual(
+            [(event["event_type"], event.get("title", event.get("module"))) for event in events[:5]],
+            [("dt_freeform", f"Undated {i}") for i in range(4)] + [("game", "DDAL00-03")],
+        )
+        self.assertEqual(len(events), 8)
+        dates = [event["datetime"] for event in events[5:]]
+        self.assertEqual(dates, sorted(dates))
+
+    @skipUnless(connection.vendor == "sqlite", "Query plans are database specific")
+    def test_timeline_reads_a_page_from_each_index(self) -> None:
+        """Each event type is read in index order up to a page of rows, rather than sorting the whole history"""
+        character = Character.objects.get(pk=2)
+        after = get_character_timeline(character, limit=1)[0]
+        with CaptureQueriesContext(connection) as context:
+            get_character_timeline(character, after=after, limit=5)
+        sql = context.captured_queries[-1]["sql"]
+        self.assertIn("LIMIT 5", sql)
+        self.assertNotIn("COALESCE", sql)
+
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("event_freeform_timeline_idx", plan)
+        self.assertIn("event_sbookupd_timeline_idx", plan)
+
+    def test_invalid_cursor(self) -> None:
+        """A cursor that wasn't issued by the server is rejected"""
+        character = Character.objects.get(pk=1)
+        response = self.client.get(
+            reverse_querystring(
+                "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"cursor": "nonsense"}
+            )
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_events_between_dates(self) -> None:
+        """Events can be limited to those that happened between two dates"""
+        character = Character.objects.get(pk=2)
+        response = self.client.get(
+            reverse_querystring(
+                "character_events",
+                kwargs={"character_uuid": character.uuid},
+                query_kwargs={"since": "2022-06-21", "until": "2022-06-22T11:46:37Z"},
+            )
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertTrue(response.data["results"][0]["datetime"].startswith("2022-06-21"))
+
+        response = self.client.get(
+            reverse_querystring(
+                "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"since": "yesterday"}
+            )
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_changed_events(self) -> None:
+        """A cursor from a feed of changes returns only the events changed since it was issued"""
+        character = Character.objects.get(pk=2)
+        url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"order": "updated"}
+        )
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 3)
+        cursor = response.data["cursor"]
+
+        changes_url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"cursor": cursor}
+        )
+        response = self.client.get(changes_url)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+        game = Game.objects.get(pk=1)
+        game.notes = "Updated notes"
+        game.save()
+        new_game = Game.objects.create(module="DDAL00-02", datetime="2021-01-01T10:00:00Z")
+        character.games.add(new_game)
+        FreeForm.objects.create(character=character, title="Carousing")
+
+        response = self.client.get(changes_url)
+        self.assertEqual(
+            [(event["event_type"], event.get("uuid")) for event in response.data["results"]],
+            [
+                ("game", str(game.uuid)),
+                ("game", str(new_game.uuid)),
+                ("dt_freeform", response.data["results"][2]["uuid"]),
+            ],
+        )
+
+    def test_removed_events(self) -> None:
+        """Events deleted or left after a cursor from a feed of changes are returned as removed markers"""
+        character = Character.objects.get(pk=2)
+        freeform = FreeForm.objects.create(character=character, title="Carousing")
+        url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"order": "updated"}
+        )
+        response = self.client.get(url)
+        cursor = response.data["cursor"]
+        self.assertFalse([event for event in response.data["results"] if event["event_type"] == "removed"])
+
+        game = character.games.order_by("pk").first()
+        other = Character.objects.exclude(pk=character.pk).first()
+        game.characters.add(other)
+        character.games.remove(game)
+        freeform.delete()
+
+        changes_url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": character.uuid}, query_kwargs={"cursor": cursor}
+        )
+        response = self.client.get(changes_url)
+        self.assertEqual(
+            [
+                (event["event_type"], event.get("removed_event_type"), event["uuid"])
+                for event in response.data["results"]
+            ],
+            [("removed", "game", str(game.uuid)), ("removed", "dt_freeform", str(freeform.uuid))],
+        )
+
+        # the game has changed for the characters still playing it
+        other_url = reverse_querystring(
+            "character_events", kwargs={"character_uuid": other.uuid}, query_kwargs={"order": "updated"}
+        )
+        self.assertEqual(self.client.get(other_url).data["results"][-1]["uuid"], str(game.uuid))
+
+        # removals aren't part of the timeline read in date order
+        response = self.client.get(reverse("character_events", kwargs={"character_uuid": character.uuid}))
+        self.assertFalse([event for event in response.data["results"] if event["event_type"] == "removed"])
+
+    def test_deleted_characters_leave_no_markers(self) -> None:
+        """Events deleted along with their character don't try to mark a timeline that no longer exists"""
+        character = Character.objects.get(pk=2)
+        character.player.delete()
+        self.assertFalse(RemovedEvent.objects.exists())
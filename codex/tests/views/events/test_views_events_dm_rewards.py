@@ -60,6 +60,25 @@ class TestDMRewardCRUDViews(TestCase):
         current_hours = DungeonMasterInfo.objects.get(player__username="testuser1").hours
         self.assertEqual(current_hours, initial_hours - int(test_data["hours"]))
 
+    def test_reward_refused_if_character_cannot_afford_it(self) -> None:
+        """A reward taking more gold than the character has is rejected without keeping the reward or its item"""
+        character = Character.objects.get(pk=1)
+        test_data = copy(self.valid_data)
+        test_data["charItems"] = character.uuid
+        test_data["gold"] = -(int(character.gold) + 10)
+        rewards = DMReward.objects.count()
+        items = MagicItem.objects.count()
+        hours = DungeonMasterInfo.objects.get(player__username="testuser1").hours
+
+        self.client.login(username="testuser1", password="testpassword")
+        response = self.client.post(reverse("dm_reward-list"), test_data)
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertIn("Insufficient gold", response.data["message"])
+        self.assertEqual(DMReward.objects.count(), rewards)
+        self.assertEqual(MagicItem.objects.count(), items)
+        self.assertEqual(DungeonMasterInfo.objects.get(player__username="testuser1").hours, hours)
+        self.assertEqual(Character.objects.get(pk=1).gold, character.gold)
+
     def test_user_can_delete_own_dm_rewards(self) -> None:
         self.client.login(username="testuser1", password="testpassword")
 
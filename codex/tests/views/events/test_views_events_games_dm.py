@@ -100,8 +100,8 @@ class TestDMGamesCRUDViews(TestCase):
 
         response = self.client.get(reverse("game-list"))
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["name"], "Lost Tales of Myth Drannor")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["name"], "Lost Tales of Myth Drannor")
 
     def test_can_list_games_by_dm_uuid(self) -> None:
         """a request for games should be filtered by the DM identifier"""
@@ -109,5 +109,5 @@ class TestDMGamesCRUDViews(TestCase):
 
         response = self.client.get(reverse("game-list") + f"?dm_uuid={dm_uuid}")
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["name"], "Lost Tales of Myth Drannor")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["name"], "Lost Tales of Myth Drannor")
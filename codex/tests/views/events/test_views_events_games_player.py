@@ -9,6 +9,7 @@ from codex.models.users import CodexUser
 from codex.models.character import Character
 from codex.models.items import MagicItem, Consumable
 from codex.models.events import Game
+from codex.models.dungeonmaster import DungeonMasterInfo
 
 
 class TestCharacterGamesCRUDViews(TestCase):
@@ -191,15 +192,16 @@ class TestCharacterGamesCRUDViews(TestCase):
 
         response = self.client.get(reverse("game-list"), {"character_uuid": character.uuid})
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
-        self.assertIsInstance(response.data, list)
-        self.assertEqual(len(response.data), 3)
-        self.assertIn("uuid", response.data[0])
-        self.assertIn("datetime", response.data[0])
-        self.assertIn("name", response.data[0])
-        self.assertIn("gold", response.data[0])
-        self.assertIn("downtime", response.data[0])
-        self.assertIn("levels", response.data[0])
+        self.assertEqual(response.data["count"], 3)
+        games = response.data["results"]
+        self.assertIsInstance(games, list)
+        self.assertEqual(len(games), 3)
+        self.assertIn("uuid", games[0])
+        self.assertIn("datetime", games[0])
+        self.assertIn("name", games[0])
+        self.assertIn("gold", games[0])
+        self.assertIn("downtime", games[0])
+        self.assertIn("levels", games[0])
 
     def test_list_returns_own_games_played_if_not_specified(self) -> None:
         """If you fail to supply a character UUID and are logged in, the list view should return all games for your characters"""
@@ -207,7 +209,37 @@ class TestCharacterGamesCRUDViews(TestCase):
 
         response = self.client.get(reverse("game-list"))
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data["count"], 3)
+
+    def test_list_own_games_not_duplicated(self) -> None:
+        """A game played by several of your characters, or that you also ran, should only be listed once"""
+        test_user = CodexUser.objects.get(username="testuser1")
+        self.client.force_login(test_user)
+        game = Game.objects.filter(characters__player=test_user).first()
+        game.characters.add(Character.objects.create(name="Second Character", player=test_user))
+        game.dm = DungeonMasterInfo.objects.get_or_create(player=test_user)[0]
+        game.save()
+
+        response = self.client.get(reverse("game-list"))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        uuids = [g["uuid"] for g in response.data["results"]]
+        self.assertEqual(len(uuids), len(set(uuids)))
+
+    def test_list_own_games_paginated(self) -> None:
+        """The list of your own games should be paged in date order"""
+        self.client.login(username="testuser1", password="testpassword")
+
+        response = self.client.get(reverse("game-list"), {"limit": 2})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+        remainder = self.client.get(response.data["next"])
+        self.assertEqual(len(remainder.data["results"]), 1)
+        dates = [g["datetime"] for g in response.data["results"] + remainder.data["results"]]
+        self.assertEqual(dates, sorted(dates))
 
     def test_owner_can_edit_game(self) -> None:
         """Test that a user who owns the game can edit it"""
@@ -0,0 +1,241 @@
+from rest_framework.status import *
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.models.events import Game
+from codex.models.items import MagicItem, Consumable
+from codex.models.items_reference import ReferenceMagicItem, ReferenceConsumable
+from codex.models.trade import Advert
+from codex.utils.character import add_reference_items_to_character, update_items_from_reference
+from codex.utils.character import get_reference_items_state
+
+
+class TestGamesReferenceItemPropagation(TestCase):
+    """Check that reference items on a game are copied to and kept in step with its characters"""
+
+    fixtures = ["test_users"]
+
+    def setUp(self) -> None:
+        self.user = CodexUser.objects.get(username="testuser1")
+        self.client.force_login(self.user)
+        self.game = Game.objects.create(module="DDAL00-01", owner=self.user)
+        for i in range(5):
+            ReferenceMagicItem.objects.create(game=self.game, name=f"Wand of Test {i}", rarity="rare")
+        ReferenceConsumable.objects.create(game=self.game, name="Potion of Healing", type="potion", charges=1)
+        self.characters = [Character.objects.create(name=f"Character {i}", player=self.user) for i in range(7)]
+
+    def test_items_added_in_bulk(self) -> None:
+        """A whole table of characters receives the game's items with one insert per item type"""
+        with CaptureQueriesContext(connection) as context:
+            add_reference_items_to_character(self.characters, self.game)
+        inserts = [query["sql"] for query in context.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+
+        for character in self.characters:
+            character.refresh_from_db()
+            self.assertEqual(character.item_count, 5)
+            self.assertEqual(character.magicitems.filter(object_id=self.game.pk).count(), 5)
+            self.assertEqual(character.consumables.get().source, self.game)
+
+    def test_single_character_added(self) -> None:
+        """A single character is still accepted"""
+        character = self.characters[0]
+        response = self.client.post(
+            reverse("game-add-character", kwargs={"uuid": self.game.uuid}), {"character_uuid": character.uuid}
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(MagicItem.objects.filter(character=character).count(), 5)
+        self.assertEqual(Consumable.objects.filter(character=character).count(), 1)
+
+    def test_list_of_characters_added(self) -> None:
+        """A list of characters is added to a game together, with one insert per item type"""
+        url = reverse("game-add-character", kwargs={"uuid": self.game.uuid})
+        data = {"character_uuids": [str(character.uuid) for character in self.characters]}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, data, content_type="application/json")
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        inserts = [query["sql"] for query in context.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+
+        self.assertEqual(self.game.characters.count(), 7)
+        for character in self.characters:
+            self.assertEqual(MagicItem.objects.filter(character=character).count(), 5)
+            self.assertEqual(Consumable.objects.filter(character=character).count(), 1)
+
+    def test_list_of_characters_rejected_together(self) -> None:
+        """Nothing is added if any character in the list can't be used"""
+        other_user = CodexUser.objects.get(username="testuser2")
+        other_character = Character.objects.create(name="Someone Else", player=other_user)
+        url = reverse("game-add-character", kwargs={"uuid": self.game.uuid})
+
+        data = {"character_uuids": [str(self.characters[0].uuid), str(other_character.uuid)]}
+        response = self.client.post(url, data, content_type="application/json")
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+        data = {"character_uuids": [str(self.characters[0].uuid), "12341234-1234-1234-1234-123456789abc"]}
+        response = self.client.post(url, data, content_type="application/json")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.game.characters.count(), 0)
+        self.assertFalse(MagicItem.objects.filter(character__in=self.characters).exists())
+
+    def test_game_created_for_list_of_characters(self) -> None:
+        """A player can log a game for several of their characters at once"""
+        data = {
+            "module": "DDAL00-02",
+            "name": "Shared table",
+            "gold": 100,
+            "downtime": 10,
+            "character_uuids": [str(character.uuid) for character in self.characters[:3]],
+        }
+        response = self.client.post(reverse("game-list"), data, content_type="application/json")
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+
+        game = Game.objects.get(uuid=response.data["uuid"])
+        self.assertEqual(game.characters.count(), 3)
+        for character in self.characters[:3]:
+            character.refresh_from_db()
+            self.assertEqual(character.gold, 100)
+            self.assertEqual(character.downtime, 10)
+
+    def test_reference_edits_keep_item_identity(self) -> None:
+        """Editing a reference item updates the copies in place"""
+        add_reference_items_to_character(self.characters, self.game)
+        copy = MagicItem.objects.filter(character=self.characters[0]).order_by("pk").first()
+        advert = Advert.objects.create(item=copy, description="For trade")
+        previous = get_reference_items_state(self.game)
+        ReferenceMagicItem.objects.filter(pk=copy.reference_id).update(rarity="veryrare", attunement=True)
+
+        with CaptureQueriesContext(connection) as context:
+            update_items_from_reference(self.characters, self.game, previous)
+        writes = [query["sql"] for query in context.captured_queries if query["sql"].startswith(("INSERT", "DELETE"))]
+        self.assertEqual(writes, [])
+
+        copy.refresh_from_db()
+        self.assertEqual((copy.rarity, copy.attunement), ("veryrare", True))
+        self.assertEqual(MagicItem.objects.filter(reference_id=copy.reference_id).count(), 7)
+        self.assertTrue(Advert.objects.filter(pk=advert.pk, item=copy).exists())
+
+    def test_unchanged_references_not_written(self) -> None:
+        """Nothing is written when the copies already match the game"""
+        add_reference_items_to_character(self.characters, self.game)
+        previous = get_reference_items_state(self.game)
+        with CaptureQueriesContext(connection) as context:
+            update_items_from_reference(self.characters, self.game, previous)
+        writes = [query["sql"] for query in context.captured_queries if not query["sql"].startswith("SELECT")]
+        self.assertEqual(writes, [])
+
+    def test_added_and_removed_references(self) -> None:
+        """New reference items are given to every character and removed ones are taken away"""
+        add_reference_items_to_character(self.characters, self.game)
+        previous = get_reference_items_state(self.game)
+        self.game.magicitems.filter(name="Wand of Test 0").delete()
+        ReferenceMagicItem.objects.create(game=self.game, name="Staff of Test", rarity="rare")
+
+        update_items_from_reference(self.characters, self.game, previous)
+        for character in self.characters:
+            names = set(character.magicitems.values_list("name", flat=True))
+            self.assertEqual(
+                names, {"Wand of Test 1", "Wand of Test 2", "Wand of Test 3", "Wand of Test 4", "Staff of Test"}
+            )
+            character.refresh_from_db()
+            self.assertEqual(character.item_count, 5)
+
+    def test_only_changed_fields_written(self) -> None:
+        """Changing one reward keeps what players have changed on their copies of the others"""
+        add_reference_items_to_character(self.characters, self.game)
+        [wand_a, wand_b] = list(self.game.magicitems.order_by("pk"))[:2]
+        copy = MagicItem.objects.get(character=self.characters[0], reference=wand_a)
+        copy.rp_name = "Sparky"
+        copy.flavour = "Hums quietly"
+        copy.save()
+
+        previous = get_reference_items_state(self.game)
+        ReferenceMagicItem.objects.filter(pk=wand_b.pk).update(rarity="veryrare")
+        update_items_from_reference(self.characters, self.game, previous)
+
+        copy.refresh_from_db()
+        self.assertEqual((copy.rp_name, copy.flavour), ("Sparky", "Hums quietly"))
+        self.assertEqual(MagicItem.objects.filter(reference=wand_b, rarity="veryrare").count(), 7)
+
+    def test_removed_copies_not_given_again(self) -> None:
+        """Copies a player has traded away or removed are updated where they are, but not given to them again"""
+        add_reference_items_to_character(self.characters, self.game)
+        wand = self.game.magicitems.order_by("pk").first()
+        outsider = Character.objects.create(name="Outsider", player=self.user)
+        MagicItem.objects.filter(character=self.characters[0], reference=wand).update(character=outsider)
+        MagicItem.objects.filter(character=self.characters[1], reference=wand).delete()
+
+        previous = get_reference_items_state(self.game)
+        ReferenceMagicItem.objects.filter(pk=wand.pk).update(description="Changed")
+        ReferenceMagicItem.objects.create(game=self.game, name="Staff of Test", rarity="rare")
+        update_items_from_reference(self.characters, self.game, previous)
+
+        self.assertFalse(MagicItem.objects.filter(character__in=self.characters[:2], reference=wand).exists())
+        self.assertEqual(MagicItem.objects.get(character=outsider).description, "Changed")
+        self.assertEqual(MagicItem.objects.filter(reference=wand, description="Changed").count(), 6)
+        self.assertEqual(MagicItem.objects.filter(name="Staff of Test").count(), 7)
+
+    def test_game_edit_updates_copies(self) -> None:
+        """Editing the game's items through the API keeps the characters' copies"""
+        self.game.characters.add(*self.characters)
+        add_reference_items_to_character(self.characters, self.game)
+        copies = set(MagicItem.objects.filter(name="Wand of Test 1").values_list("pk", flat=True))
+
+        items = [{"name": f"Wand of Test {i}", "rarity": "rare"} for i in range(5)]
+        items[1]["description"] = "Now with instructions"
+        response = self.client.patch(
+            reverse("game-detail", kwargs={"uuid": self.game.uuid}),
+            {"magicitems": items, "consumables": []},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+        updated = MagicItem.objects.filter(name="Wand of Test 1")
+        self.assertEqual(set(updated.values_list("pk", flat=True)), copies)
+        self.assertEqual(set(updated.values_list("description", flat=True)), {"Now with instructions"})
+        self.assertEqual(Consumable.objects.filter(character__in=self.characters).count(), 0)
+
+    def test_game_edit_without_items(self) -> None:
+        """Edits that don't include the items leave the reference items and their copies alone"""
+        self.game.characters.add(*self.characters)
+        add_reference_items_to_character(self.characters, self.game)
+        references = list(self.game.magicitems.values_list("pk", flat=True))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                reverse("game-detail", kwargs={"uuid": self.game.uuid}),
+                {"notes": "An uneventful session"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(list(self.game.magicitems.values_list("pk", flat=True)), references)
+        writes = [query["sql"] for query in context.captured_queries if not query["sql"].startswith("SELECT")]
+        self.assertFalse([sql for sql in writes if "codex_magicitem" in sql or "codex_referencemagicitem" in sql])
+
+    def test_game_edit_items_by_uuid(self) -> None:
+        """Reference items sent with their uuid are updated in place, missing ones are removed"""
+        self.game.characters.add(*self.characters)
+        add_reference_items_to_character(self.characters, self.game)
+        references = list(self.game.magicitems.order_by("pk"))
+
+        items = [{"uuid": str(reference.uuid), "name": reference.name} for reference in references[1:]]
+        items[0]["rarity"] = "legendary"
+        items.append({"name": "Staff of Test", "rarity": "rare"})
+        response = self.client.patch(
+            reverse("game-detail", kwargs={"uuid": self.game.uuid}),
+            {"magicitems": items},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+        self.assertFalse(ReferenceMagicItem.objects.filter(pk=references[0].pk).exists())
+        self.assertEqual(ReferenceMagicItem.objects.get(pk=references[1].pk).rarity, "legendary")
+        self.assertEqual(self.game.magicitems.count(), 5)
+        self.assertEqual(self.game.consumables.count(), 1)
+        self.assertEqual(MagicItem.objects.filter(reference=references[1], rarity="legendary").count(), 7)
+        self.assertEqual(MagicItem.objects.filter(name="Staff of Test").count(), 7)
+        self.assertEqual(MagicItem.objects.filter(name=references[0].name).count(), 0)
@@ -5,6 +5,9 @@ from rest_framework.status import *
 from django.test import TestCase
 from django.urls import reverse
 
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.models.items_reference import ReferenceMagicItem
 from codex.models.events import Game
 
 
@@ -13,21 +16,53 @@ class TestPlayerGamesCRUDViews(TestCase):
 
     fixtures = ["test_users", "test_characters", "test_character_games", "test_dungeonmaster_games"]
 
-    def test_list_own_games(self) -> None:
-        self.client.login(username="testuser1", password="testpassword")
+    # session, user, characters, character/game links and the three game prefetches
+    list_queries = 7
 
+    def get_games(self):
         response = self.client.get(reverse("games-list"))
         self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 2)
-        self.assertIn("character", response.data[0])
-        self.assertIn("games", response.data[0])
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_list_own_games(self) -> None:
+        self.client.login(username="testuser1", password="testpassword")
+
+        data = self.get_games()
+        self.assertGreaterEqual(len(data), 2)
+        self.assertIn("character", data[0])
+        self.assertIn("games", data[0])
+
+    def test_list_groups_games_by_character(self) -> None:
+        """Each character should be listed with only the games it played, in date order"""
+        self.client.login(username="testuser1", password="testpassword")
+
+        data = {entry["character"]["uuid"]: entry["games"] for entry in self.get_games()}
+        for character in Character.objects.filter(player__username="testuser1"):
+            expected = [str(game.uuid) for game in character.games.order_by("datetime", "pk")]
+            self.assertEqual([game["uuid"] for game in data[str(character.uuid)]], expected)
+
+    def test_list_query_count_is_constant(self) -> None:
+        """Adding characters and games should not add queries"""
+        user = CodexUser.objects.get(username="testuser1")
+        self.client.force_login(user)
+        with self.assertNumQueries(self.list_queries):
+            self.get_games()
+
+        for i in range(3):
+            character = Character.objects.create(name=f"Extra {i}", player=user)
+            for j in range(3):
+                game = Game.objects.create(module=f"DDAL00-0{j}", owner=user)
+                game.characters.add(character, Character.objects.get(pk=1))
+                ReferenceMagicItem.objects.create(game=game, name=f"Bag of holding {j}")
+
+        with self.assertNumQueries(self.list_queries):
+            data = self.get_games()
+        self.assertEqual(sum(len(entry["games"]) for entry in data), 3 + 9 + 9)
 
     def test_list_no_games(self) -> None:
         self.client.login(username="testuser3", password="testpassword")
 
-        response = self.client.get(reverse("games-list"))
-        self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(self.get_games(), [])
 
     def test_anonymous_access_fails(self) -> None:
         response = self.client.get(reverse("games-list"))
@@ -0,0 +1,128 @@
+import io
+import zipfile
+from unittest import mock
+
+from rest_framework.status import *
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.imports.csv import expected_character_header, expected_event_header
+
+
+def make_export(name: str, games: int = 3) -> str:
+    """Build a minimal Adventurers League Logs export"""
+    lines = [expected_character_header, f"{name},Elf,Wizard 4,,,,,true", expected_event_header]
+    for i in range(games):
+        lines.append(
+            f"CharacterLogEntry,DDAL00-0{i} The Test {i},,2024-01-{i % 28 + 1:02d},4,,,100,10,,,"
+            "Online,Some DM,,Notes,,"
+        )
+        lines.append(f"MAGIC ITEM,Wand of Test {i},uncommon,,,,Found in a chest")
+    lines.append("TRADED MAGIC ITEM,Wand of Test 0,uncommon,,,,")
+    return "\n".join(lines) + "\n"
+
+
+class TestCharacterImportViews(TestCase):
+    """Check single and batch character imports"""
+
+    fixtures = ["test_users"]
+
+    def setUp(self) -> None:
+        self.client.force_login(CodexUser.objects.get(username="testuser1"))
+
+    def assertImported(self, name: str, games: int, items: int):
+        character = Character.objects.get(name=name)
+        self.assertEqual(character.games.count(), games)
+        self.assertEqual(character.magicitems.count(), items)
+        self.assertEqual((character.game_count, character.item_count), (games, items))
+        return character
+
+    def test_single_import(self) -> None:
+        """A single export can still be sent as a string"""
+        response = self.client.put(
+            reverse("character_import"), {"importData": make_export("Meepo")}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertEqual(response.data["name"], "Meepo")
+        self.assertImported("Meepo", 3, 2)
+
+    def test_invalid_import(self) -> None:
+        """An export without the expected headers is rejected"""
+        response = self.client.put(
+            reverse("character_import"), {"importData": "not,a,log\n"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertIn("message", response.data)
+
+    def test_batch_import(self) -> None:
+        """Multiple exports and zip archives are imported in one request, failures are reported per file"""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("group/second.csv", make_export("Second", games=2))
+            zf.writestr("group/third.csv", make_export("Third", games=1))
+            zf.writestr("readme.txt", "ignored")
+        files = [
+            SimpleUploadedFile("first.csv", make_export("First", games=20).encode()),
+            SimpleUploadedFile("group.zip", archive.getvalue()),
+            SimpleUploadedFile("broken.csv", b"nonsense\n"),
+        ]
+
+        response = self.client.put(
+            reverse("character_import"), encode_multipart(BOUNDARY, {"files": files}), content_type=MULTIPART_CONTENT
+        )
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertEqual([c["name"] for c in response.data["characters"]], ["First", "Second", "Third"])
+        self.assertEqual(response.data["errors"][0]["file"], "broken.csv")
+        self.assertImported("First", 20, 19)
+        self.assertImported("Second", 2, 1)
+        self.assertImported("Third", 1, 0)
+
+    def test_malformed_archive_refused(self) -> None:
+        """A damaged zip archive is reported as a bad request rather than an error"""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("export.csv", make_export("Broken"))
+        corrupted = b"JUNK" + archive.getvalue()[4:]
+        files = [SimpleUploadedFile("broken.zip", corrupted)]
+
+        response = self.client.put(
+            reverse("character_import"), encode_multipart(BOUNDARY, {"files": files}), content_type=MULTIPART_CONTENT
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["file"], "broken.zip/export.csv")
+        self.assertFalse(Character.objects.filter(name="Broken").exists())
+
+    @mock.patch("codex.imports.uploads.MAX_EXPORT_SIZE", 1024)
+    def test_oversized_exports_refused(self) -> None:
+        """Exports over the size limit are refused before anything is imported"""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("large.csv", make_export("Large", games=50))
+        files = [
+            SimpleUploadedFile("small.csv", make_export("Small", games=1).encode()),
+            SimpleUploadedFile("group.zip", archive.getvalue()),
+        ]
+        self.assertLess(len(archive.getvalue()), 1024)
+
+        response = self.client.put(
+            reverse("character_import"), encode_multipart(BOUNDARY, {"files": files}), content_type=MULTIPART_CONTENT
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["file"], "group.zip/large.csv")
+        self.assertFalse(Character.objects.exists())
+
+    @mock.patch("codex.imports.uploads.MAX_UPLOAD_SIZE", 1024)
+    def test_oversized_uploads_refused(self) -> None:
+        """Uploads over the size limit are refused"""
+        files = [SimpleUploadedFile("large.csv", make_export("Large", games=50).encode())]
+
+        response = self.client.put(
+            reverse("character_import"), encode_multipart(BOUNDARY, {"files": files}), content_type=MULTIPART_CONTENT
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["file"], "large.csv")
+        self.assertFalse(Character.objects.exists())
@@ -0,0 +1,131 @@
+import io
+import zipfile
+from datetime import timedelta
+from io import StringIO
+
+from rest_framework.status import *
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from codex.models.users import CodexUser
+from codex.models.character import Character
+from codex.models.imports import ImportJob
+from codex.imports.jobs import IMPORT_JOB_TIMEOUT, claim_import_job
+from codex.tests.views.imports.test_views_imports_character import make_export
+
+
+class TestImportJobViews(TestCase):
+    """Check queued character imports and their status reporting"""
+
+    fixtures = ["test_users"]
+
+    def setUp(self) -> None:
+        self.client.force_login(CodexUser.objects.get(username="testuser1"))
+
+    def run_worker(self) -> str:
+        output = StringIO()
+        call_command("run_import_worker", "--once", stdout=output)
+        return output.getvalue()
+
+    def get_job(self, uuid):
+        return self.client.get(reverse("import_job-detail", kwargs={"uuid": uuid}))
+
+    def test_job_queued_and_processed(self) -> None:
+        """Submitting an export returns straight away, the worker creates the character and records the counts"""
+        response = self.client.post(
+            reverse("import_job-list"), {"importData": make_export("Meepo")}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        job = response.data[0]
+        self.assertEqual(job["status"], "pending")
+        self.assertFalse(Character.objects.filter(name="Meepo").exists())
+
+        self.assertIn("Imported Meepo", self.run_worker())
+
+        response = self.get_job(job["uuid"])
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        character = Character.objects.get(name="Meepo")
+        self.assertEqual(response.data["status"], "complete")
+        self.assertEqual(response.data["character_uuid"], character.uuid)
+        self.assertEqual(
+            (response.data["events_parsed"], response.data["games_created"], response.data["items_created"]), (7, 3, 2)
+        )
+        self.assertEqual(ImportJob.objects.get(uuid=job["uuid"]).data, "")
+
+    def test_failed_job(self) -> None:
+        """An invalid export marks the job as failed with a reason"""
+        response = self.client.post(
+            reverse("import_job-list"), {"importData": "not,a,log\n"}, content_type="application/json"
+        )
+        self.run_worker()
+
+        response = self.get_job(response.data[0]["uuid"])
+        self.assertEqual(response.data["status"], "failed")
+        self.assertIn("Adventurers League Logs", response.data["message"])
+
+    def test_uploaded_files_queued(self) -> None:
+        """Each uploaded file is queued as its own job"""
+        files = [
+            SimpleUploadedFile("first.csv", make_export("First").encode()),
+            SimpleUploadedFile("second.csv", make_export("Second").encode()),
+        ]
+        response = self.client.post(reverse("import_job-list"), {"files": files})
+        self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        self.assertEqual([job["filename"] for job in response.data], ["first.csv", "second.csv"])
+
+        self.run_worker()
+        self.assertEqual(ImportJob.objects.filter(status=ImportJob.Status.COMPLETE).count(), 2)
+
+    def test_jobs_are_private(self) -> None:
+        """Users can only see their own jobs and must provide data"""
+        response = self.client.post(reverse("import_job-list"), {}, content_type="application/json")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+        job = ImportJob.objects.create(user=CodexUser.objects.get(username="testuser2"), data="")
+        self.assertEqual(self.get_job(job.uuid).status_code, HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse("import_job-list")).data["count"], 0)
+
+    def test_malformed_uploads_refused(self) -> None:
+        """Uploads that aren't UTF-8 text or are broken zip archives are rejected rather than erroring"""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("export.csv", make_export("Broken"))
+        corrupted = b"JUNK" + archive.getvalue()[4:]
+
+        for upload in [
+            SimpleUploadedFile("latin1.csv", "name,Mée\n".encode("latin-1")),
+            SimpleUploadedFile("broken.zip", corrupted),
+        ]:
+            response = self.client.post(reverse("import_job-list"), {"files": [upload]})
+            self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+            self.assertIn("message", response.data)
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_abandoned_jobs_reclaimed(self) -> None:
+        """A job left running by a worker that died is picked up again once it times out"""
+        user = CodexUser.objects.get(username="testuser1")
+        recent = ImportJob.objects.create(
+            user=user, data=make_export("Recent"), status=ImportJob.Status.RUNNING, started=timezone.now()
+        )
+        abandoned = ImportJob.objects.create(
+            user=user,
+            data=make_export("Abandoned"),
+            status=ImportJob.Status.RUNNING,
+            started=timezone.now() - IMPORT_JOB_TIMEOUT - timedelta(minutes=1),
+        )
+
+        self.assertEqual(claim_import_job(), abandoned)
+        self.assertIsNone(claim_import_job())
+
+        self.run_worker()
+        abandoned.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual(recent.status, ImportJob.Status.RUNNING)
+        self.assertEqual(abandoned.status, ImportJob.Status.RUNNING)
+
+        ImportJob.objects.filter(pk=abandoned.pk).update(started=timezone.now() - IMPORT_JOB_TIMEOUT * 2)
+        self.assertIn("Imported Abandoned", self.run_worker())
+        self.assertTrue(Character.objects.filter(name="Abandoned").exists())
@@ -10,6 +10,7 @@ from codex.views.data.character import CharacterViewSet
 from codex.views.data.character_images import CharacterImageView
 from codex.views.data.items.sources import ItemSourceView
 from codex.views.imports.character import CharacterImportView
+from codex.views.imports.jobs import ImportJobViewSet
 
 from codex.views.events.magicitem_events import MagicItemEventView
 from codex.views.events.character_events import CharacterEventView
@@ -37,6 +38,7 @@ router.register(r"dm_log", DMLogViewSet, basename="dm_log")
 router.register(r"dm_reward", DMRewardViewSet, basename="dm_reward")
 router.register(r"spellbook", EventDowntimeSpellbookUpdateView, basename="spellbook_update")
 router.register(r"freeform", EventDowntimeFreeFormView, basename="freeform")
+router.register(r"import_job", ImportJobViewSet, basename="import_job")
 
 
 urlpatterns = [
@@ -0,0 +1,35 @@
+from django.core.cache import cache
+
+from codex.models.api_keys import APIKey, hash_key
+
+API_KEY_CACHE_TTL = 300
+
+
+def get_api_key_cache_key(hashed_value: str) -> str:
+    """Name a validated key is stored under in the shared cache"""
+    return f"codex:apikey:{hashed_value}"
+
+
+def forget_api_key(hashed_value: str) -> None:
+    """Check a key against the database again, called whenever an API key is changed or removed"""
+    cache.delete(get_api_key_cache_key(hashed_value))
+
+
+def is_valid_api_key(key: str) -> bool:
+    """Check a key against the stored hashes, recently validated keys are answered from the shared cache
+
+    The cache is shared between processes, so a key that is removed stops working everywhere at once
+    """
+    if not key:
+        return False
+    hashed = hash_key(key)
+    cache_key = get_api_key_cache_key(hashed)
+    if cache.get(cache_key):
+        return True
+
+    # No separate constant time comparison is needed, the lookup compares SHA-256 hashes of the key rather than the
+    # key itself, so timing can only reveal how much of the hash of a guess matches and that doesn't help find a key
+    if not APIKey.objects.filter(hashed_value=hashed).exists():
+        return False
+    cache.set(cache_key, True, API_KEY_CACHE_TTL)
+    return True
@@ -1,59 +1,242 @@
+import hashlib
+from typing import Iterable, List
+
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value, prefetch_related_objects
+from django.db.models.functions import Coalesce
+from django.utils.http import quote_etag
 
 from codex.models.character import Character
 from codex.models.items import MagicItem, Consumable
 from codex.models.events import Game
+from codex.models.events_downtime import FreeForm, SpellbookUpdate
+
+
+def bump_character_version(*character_ids: int) -> None:
+    """Mark characters as changed so that cached copies held by clients are invalidated"""
+    Character.objects.filter(pk__in=[pk for pk in character_ids if pk]).update(version=F("version") + 1)
+
+
+def count_for_character(model, field: str = "character"):
+    """Correlated subquery counting the rows of a model that belong to the outer character"""
+    rows = model.objects.filter(**{field: OuterRef("pk")}).order_by().values(field)
+    return Coalesce(Subquery(rows.annotate(total=Count("pk")).values("total")), Value(0), output_field=IntegerField())
+
+
+def get_counter_expressions() -> dict:
+    """Expressions giving the true value of each denormalised character counter"""
+    return {
+        "item_count": count_for_character(MagicItem),
+        "game_count": count_for_character(Game.characters.through),
+        "event_count": count_for_character(FreeForm) + count_for_character(SpellbookUpdate),
+    }
+
+
+def update_character_counters(*character_ids: int) -> None:
+    """Recalculate item, game and event counts for characters in a single UPDATE, marking them as changed"""
+    Character.objects.filter(pk__in=[pk for pk in character_ids if pk]).update(
+        **get_counter_expressions(), version=F("version") + 1
+    )
+
+
+def get_character_etag(character: Character, request) -> str:
+    """Entity tag for a serialised character, varies with the viewer and the representation requested"""
+    viewer = request.user.pk or 0
+    representation = hashlib.md5(f"{viewer}:{request.GET.urlencode()}".encode()).hexdigest()[:8]
+    return quote_etag(f"{character.uuid}-{character.version}-{representation}")
+
+
+def load_character_inventories(
+    characters: Iterable[Character], inventories: Iterable[str] = ("magicitems", "consumables")
+) -> List[Character]:
+    """Attach magic items and consumables to a batch of characters, using one query per inventory table"""
+    characters = list(characters)
+    # The prefetch also points each item back at its parent, so owner details need no further queries
+    prefetch_related_objects(characters, *inventories)
+    return characters
+
+
+def update_character_rewards(char: Character, gold: float = 0, downtime: float = 0) -> None:
+    """Apply gold and downtime changes to a character with a single conditional UPDATE
+
+    The arithmetic happens in the database so concurrent changes can't be lost. Deductions are only applied if
+    the character can afford them, otherwise a ValueError is raised and nothing is changed
+    """
+    gold = float(gold or 0)
+    downtime = float(downtime or 0)
+    if not gold and not downtime:
+        return
+
+    queryset = Character.objects.filter(pk=char.pk)
+    if gold < 0:
+        queryset = queryset.filter(gold__gte=-gold)
+    if downtime < 0:
+        queryset = queryset.filter(downtime__gte=-downtime)
+    updated = queryset.update(
+        gold=Coalesce(F("gold"), Value(0.0)) + gold,
+        downtime=Coalesce(F("downtime"), Value(0.0)) + downtime,
+        version=F("version") + 1,
+    )
+
+    char.refresh_from_db(fields=["gold", "downtime", "version"])
+    if not updated:
+        if gold < 0 and (char.gold or 0) < -gold:
+            raise ValueError(f"Insufficient gold, this character has {char.gold or 0} gp")
+        raise ValueError(f"Insufficient downtime, this character has {char.downtime or 0} days")
+
+
+# Fields copied from a game's reference items to the items given to its characters
+MAGIC_ITEM_REFERENCE_FIELDS = [
+    "name",
+    "description",
+    "rarity",
+    "flavour",
+    "rp_name",
+    "minor_properties",
+    "url",
+    "attunement",
+]
+CONSUMABLE_REFERENCE_FIELDS = ["name", "type", "description", "rarity", "charges"]
+
+
+def copy_reference_item(model, reference, fields: List[str], character: Character, game: Game):
+    """Create an unsaved inventory item for a character from one of a game's reference items"""
+    return model(
+        character=character,
+        content_type=ContentType.objects.get_for_model(Game),
+        object_id=game.pk,
+        reference=reference,
+        **{field: getattr(reference, field) for field in fields},
+    )
+
+
+def add_reference_items_to_character(characters: Character | Iterable[Character], game: Game) -> None:
+    """Give copies of a game's reference items to one or more characters, with one insert per item type"""
+    if isinstance(characters, Character):
+        characters = [characters]
+    characters = list(characters)
+    reference_items = list(game.magicitems.all())
+    reference_consumables = list(game.consumables.all())
+    if not characters or not (reference_items or reference_consumables):
+        return
+
+    MagicItem.objects.bulk_create(
+        copy_reference_item(MagicItem, item, MAGIC_ITEM_REFERENCE_FIELDS, character, game)
+        for character in characters
+        for item in reference_items
+    )
+    Consumable.objects.bulk_create(
+        copy_reference_item(Consumable, consumable, CONSUMABLE_REFERENCE_FIELDS, character, game)
+        for character in characters
+        for consumable in reference_consumables
+    )
+
+    # bulk creation bypasses the signals that maintain the counters
+    update_character_counters(*[character.pk for character in characters])
+
+
+def get_reference_items_state(game: Game) -> tuple:
+    """A comparable snapshot of a game's reference items, used to tell whether they have been changed"""
+    return (
+        tuple(game.magicitems.order_by("pk").values_list("pk", *MAGIC_ITEM_REFERENCE_FIELDS)),
+        tuple(game.consumables.order_by("pk").values_list("pk", *CONSUMABLE_REFERENCE_FIELDS)),
+    )
+
+
+def sync_reference_copies(
+    model, references: list, previous: tuple, fields: List[str], characters: List[Character], game: Game
+) -> set:
+    """Push the changes made to one type of a game's reference items to the copies made from them
 
+    previous holds the rows of the reference items before they were changed, from get_reference_items_state. Only
+    the fields that changed on each reference item are written to its copies, so anything players changed on their
+    own copies is kept. Items new to the game are given to the characters, but copies that a player has since traded
+    away or removed are not given again. Returns the ids of the characters whose items were changed
+    """
+    previous = {row[0]: dict(zip(fields, row[1:])) for row in previous}
+    current = {reference.pk: reference for reference in references}
+    # reference items sent without their uuid are recreated, so they're compared with the one they replace by name
+    replaced = {values["name"]: values for pk, values in previous.items() if pk not in current}
 
-def update_character_rewards(char: Character, gold: float = 0, downtime: int = 0):
-    """Update a character with rewards"""
-    if not char.gold:
-        char.gold = 0.0
-    if not char.downtime:
-        char.downtime = 0.0
-
-    char.gold += gold
-    char.downtime += downtime
-    char.save()
-
-
-def add_reference_items_to_character(character: Character, game: Game) -> None:
-    for item in game.magicitems.all():
-        MagicItem.objects.create(
-            character=character,
-            source=game,
-            # Copy the magic item data from the reference item to the new item
-            name=item.name,
-            description=item.description,
-            rarity=item.rarity,
-            flavour=item.flavour,
-            rp_name=item.rp_name,
-            minor_properties=item.minor_properties,
-            url=item.url,
-            attunement=item.attunement,
-        )
-
-    for consumable in game.consumables.all():
-        Consumable.objects.create(
-            character=character,
-            source=game,
-            # Copy the consumable data from the reference item to the new item
-            name=consumable.name,
-            type=consumable.type,
-            description=consumable.description,
-            rarity=consumable.rarity,
-            charges=consumable.charges,
-        )
-
-
-def update_items_from_reference(character: Character, game: Game) -> None:
-    """Reflect changes made to reference items on a game into the copies in a characters inventory"""
-    # get all affected items (that the character still owns)
-    items = character.magicitems.filter(object_id=game.id, content_type=ContentType.objects.get_for_model(Game).id)
-    consumables = character.consumables.filter(
-        object_id=game.id, content_type=ContentType.objects.get_for_model(Game).id
-    )
-    # remove them and add the new ones
-    items.delete()
-    consumables.delete()
-    add_reference_items_to_character(character, game)
+    changes = {}
+    replacements = {}
+    new = []
+    for reference in references:
+        old = previous.get(reference.pk)
+        if old is None and reference.name in replaced:
+            old = replaced.pop(reference.name)
+            replacements[reference.name] = reference
+        if old is None:
+            new.append(reference)
+        else:
+            changes[reference.pk] = [field for field in fields if getattr(reference, field) != old[field]]
+
+    # copies keep the game as their source when traded, and lose their reference when it's removed from the game
+    copies = model.objects.filter(content_type=ContentType.objects.get_for_model(Game), object_id=game.pk).filter(
+        Q(reference_id__in=[pk for pk, changed in changes.items() if changed]) | Q(reference__isnull=True)
+    )
+
+    changed_characters = set()
+    updated = []
+    updated_fields = set()
+    removed = []
+    for copy in copies:
+        if copy.reference_id is None:
+            reference = replacements.get(copy.name)
+            if not reference:
+                removed.append(copy.pk)
+                changed_characters.add(copy.character_id)
+                continue
+            copy.reference = reference
+            changed = changes[reference.pk] + ["reference"]
+        else:
+            reference = current[copy.reference_id]
+            changed = changes[reference.pk]
+
+        for field in changed:
+            if field != "reference":
+                setattr(copy, field, getattr(reference, field))
+        updated.append(copy)
+        updated_fields.update(changed)
+        changed_characters.add(copy.character_id)
+
+    added = [
+        copy_reference_item(model, reference, fields, character, game) for character in characters for reference in new
+    ]
+    changed_characters.update(copy.character_id for copy in added)
+
+    if updated:
+        model.objects.bulk_update(updated, sorted(updated_fields))
+    if removed:
+        model.objects.filter(pk__in=removed).delete()
+    if added:
+        model.objects.bulk_create(added)
+    return changed_characters
+
+
+def update_items_from_reference(characters: Character | Iterable[Character], game: Game, previous: tuple) -> None:
+    """Reflect changes made to reference items on a game into the copies in the characters' inventories
+
+    previous is the get_reference_items_state of the game from before its reference items were changed. Copies are
+    matched to their reference item so that only changed fields are written, and items keep their identity along
+    with any adverts, offers and edit history attached to them
+    """
+    if isinstance(characters, Character):
+        characters = [characters]
+    characters = list(characters)
+    (previous_items, previous_consumables) = previous
+
+    changed_characters = sync_reference_copies(
+        MagicItem, list(game.magicitems.all()), previous_items, MAGIC_ITEM_REFERENCE_FIELDS, characters, game
+    )
+    changed_characters |= sync_reference_copies(
+        Consumable,
+        list(game.consumables.all()),
+        previous_consumables,
+        CONSUMABLE_REFERENCE_FIELDS,
+        characters,
+        game,
+    )
+    if changed_characters:
+        # bulk changes bypass the signals that maintain the counters
+        update_character_counters(*changed_characters)
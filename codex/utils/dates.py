@@ -0,0 +1,30 @@
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+
+def get_day(value: date | datetime) -> date:
+    """The calendar day of a date or datetime in the configured TIME_ZONE"""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+def get_day_range(start: date | datetime, end: date | datetime | None = None) -> tuple[datetime, datetime]:
+    """Half open [start of the first day, start of the day after the last) range in the configured TIME_ZONE"""
+    end = end if end is not None else start
+    tz = timezone.get_default_timezone()
+    start_of_range = timezone.make_aware(datetime.combine(get_day(start), time.min), tz)
+    end_of_range = timezone.make_aware(datetime.combine(get_day(end) + timedelta(days=1), time.min), tz)
+    return start_of_range, end_of_range
+
+
+def filter_days(
+    queryset: QuerySet, field: str, start: date | datetime, end: date | datetime | None = None
+) -> QuerySet:
+    """Filter a datetime field to whole days as a range rather than a __date cast, so its index can be used"""
+    start_of_range, end_of_range = get_day_range(start, end)
+    return queryset.filter(**{f"{field}__gte": start_of_range, f"{field}__lt": end_of_range})
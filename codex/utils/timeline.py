@@ -0,0 +1,114 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import CharField, F, Q, Value
+
+from codex.models.character import Character
+from codex.models.events import Game, DMReward, RemovedEvent
+from codex.models.events_downtime import SpellbookUpdate, FreeForm
+
+# Event type, model and the lookup that links it to a character for each kind of event in the timeline
+TIMELINE_SOURCES = [
+    ("game", Game, "characters"),
+    ("dm_reward", DMReward, "character_items_assigned"),
+    ("dt_sbookupd", SpellbookUpdate, "character"),
+    ("dt_freeform", FreeForm, "character"),
+]
+
+# Markers left by events that have left a timeline, only listed when fetching changes so clients can drop them
+TIMELINE_REMOVALS = ("removed", RemovedEvent, "character")
+
+# Timelines can be read in the order events happened, or in the order they were last changed to fetch updates
+TIMELINE_ORDERS = {"datetime": "datetime", "updated": "updated"}
+
+
+def get_timeline_sort_key(key: tuple) -> tuple:
+    """Sort key for (sort value, event type, id), events without a date are placed at the start of the timeline"""
+    (sort_value, event_type, pk) = key
+    return (sort_value is not None, sort_value, event_type, pk)
+
+
+def encode_timeline_cursor(order: str, key: tuple) -> str:
+    """Convert a timeline order and key of (sort value, event type, id) to an opaque cursor string"""
+    (sort_value, event_type, pk) = key
+    data = json.dumps([order, sort_value.isoformat() if sort_value is not None else None, event_type, pk])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_timeline_cursor(cursor: str) -> tuple:
+    """Convert a cursor string back to a timeline order and key, raising ValueError if it is not valid"""
+    try:
+        [order, sort_value, event_type, pk] = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if order not in TIMELINE_ORDERS:
+            raise ValueError(f"Unknown timeline order {order}")
+        sort_value = datetime.fromisoformat(sort_value) if sort_value is not None else None
+        return (order, (sort_value, str(event_type), int(pk)))
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_timeline_segments(queryset, field: str, event_type: str, after: tuple | None) -> list:
+    """Parts of one event type's timeline after the key given, each a filter the (character, field) index can serve
+
+    Events without a value for the field come first and are kept as their own segment, so that everything else can
+    be filtered and ordered on the raw column
+    """
+    undated = queryset.filter(**{f"{field}__isnull": True})
+    dated = queryset.filter(**{f"{field}__isnull": False})
+    if not after:
+        return [undated, dated]
+
+    (after_value, after_type, after_pk) = after
+    # The event type is fixed within a segment, so the keyset comparison on it is settled here rather than in SQL
+    if after_value is None:
+        if event_type < after_type:
+            return [dated]
+        if event_type == after_type:
+            return [undated.filter(pk__gt=after_pk), dated]
+        return [undated, dated]
+
+    if event_type < after_type:
+        return [dated.filter(**{f"{field}__gt": after_value})]
+    if event_type == after_type:
+        return [dated.filter(Q(**{f"{field}__gt": after_value}) | Q(**{field: after_value, "pk__gt": after_pk}))]
+    return [dated.filter(**{f"{field}__gte": after_value})]
+
+
+def get_character_timeline(
+    character: Character,
+    order: str = "datetime",
+    after: tuple | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = 100,
+) -> list:
+    """Keys of (sort value, event type, id) for a character's events, starting after the key given
+
+    Events are sorted by when they happened or when they were last changed, and can be limited to those that
+    happened between since (inclusive) and until (exclusive). In the order they were changed, events that were
+    deleted or that the character left are included as removed markers. Each event type reads at most a page of rows
+    in index order, and the candidates are combined with a single UNION ALL query
+    """
+    field = TIMELINE_ORDERS[order]
+    sources = TIMELINE_SOURCES + [TIMELINE_REMOVALS] if order == "updated" else TIMELINE_SOURCES
+    querysets = []
+    for event_type, model, lookup in sources:
+        queryset = model.objects.filter(**{lookup: character})
+        if since:
+            queryset = queryset.filter(datetime__gte=since)
+        if until:
+            queryset = queryset.filter(datetime__lt=until)
+
+        for segment in get_timeline_segments(queryset, field, event_type, after):
+            # The page is taken in a subquery, as not every database allows a LIMIT on each part of a UNION
+            page = segment.order_by(field, "pk").values("pk")[:limit]
+            querysets.append(
+                model.objects.filter(pk__in=page)
+                .annotate(event_type=Value(event_type, output_field=CharField()), sort_value=F(field))
+                .values_list("sort_value", "event_type", "pk")
+                .order_by()
+            )
+
+    timeline = querysets[0].union(*querysets[1:], all=True)
+    return sorted(timeline, key=get_timeline_sort_key)[:limit]
@@ -1,10 +1,16 @@
 from rest_framework import viewsets
 from rest_framework.status import *
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.utils.http import parse_etags
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from codex.models.character import Character
-from codex.serialisers.characters import CharacterSerialiser, CharacterDetailsSerialiser
+from codex.serialisers.characters import CharacterSerialiser, CharacterDetailsSerialiser, CharacterSummarySerialiser
+from codex.utils.character import load_character_inventories, get_character_etag
+
+# Expandable serialiser fields and the inventory relation that backs each of them
+CHARACTER_INVENTORIES = {"items": "magicitems", "consumables": "consumables"}
 
 
 class CharacterViewSet(viewsets.GenericViewSet):
@@ -17,9 +23,50 @@ class CharacterViewSet(viewsets.GenericViewSet):
     serializer_class = CharacterSerialiser
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def get_fieldset(self):
+        """Parse the `fields` and `expand` query parameters into the fields and inventories to return
+
+        With neither parameter the full representation is used. Fields is None when all fields are wanted
+        """
+        requested_fields = self.request.query_params.get("fields")
+        requested_expand = self.request.query_params.get("expand")
+        if requested_fields is None and requested_expand is None:
+            return (None, list(CHARACTER_INVENTORIES))
+
+        expand = [name for name in (requested_expand or "").split(",") if name in CHARACTER_INVENTORIES]
+        if requested_fields is None:
+            return (None, expand)
+
+        available = set(CharacterDetailsSerialiser().fields) - set(CHARACTER_INVENTORIES)
+        fields = ["uuid"] + [name for name in requested_fields.split(",") if name in available and name != "uuid"]
+        return (fields, expand)
+
+    def get_serialiser_fields(self, fields, expand):
+        """Fields to pass to the details serialiser, None for all of them"""
+        if fields is None:
+            if len(expand) == len(CHARACTER_INVENTORIES):
+                return None
+            return list(set(CharacterDetailsSerialiser().fields) - set(CHARACTER_INVENTORIES)) + expand
+        return fields + expand
+
+    def get_columns(self, fields, expand):
+        """Database columns needed to serialise the requested fields"""
+        columns = [name for name in fields if name != "editable"]
+        if "editable" in fields:
+            columns.append("player")
+        if expand:
+            # Inventory items report their owner's name and check the owner's player to see if they are editable
+            columns += ["name", "player"]
+        return list(dict.fromkeys(columns + ["version"]))
+
     def get_queryset(self):
-        """Retrieve base queryset"""
-        return Character.objects.all()
+        """Retrieve base queryset, leaving out any columns a read request hasn't asked for"""
+        queryset = Character.objects.all()
+        if self.action in ["list", "retrieve"]:
+            fields, expand = self.get_fieldset()
+            if fields is not None:
+                queryset = queryset.only(*self.get_columns(fields, expand))
+        return queryset
 
     def create(self, request):
         """Create a new character, ownership set to requesting user"""
@@ -33,19 +80,48 @@ class CharacterViewSet(viewsets.GenericViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         """Get details for a single character"""
+        fields, expand = self.get_fieldset()
         character = self.get_object()
-        serializer = CharacterDetailsSerialiser(character, context={"user": request.user})
-        return Response(serializer.data)
+
+        # Clients holding the current version can skip loading and serialising inventories entirely
+        etag = get_character_etag(character, request)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        load_character_inventories([character], [CHARACTER_INVENTORIES[name] for name in expand])
+        serializer = CharacterDetailsSerialiser(
+            character, fields=self.get_serialiser_fields(fields, expand), context={"user": request.user}
+        )
+        return Response(serializer.data, headers={"ETag": etag})
 
     def list(self, request):
         """List all characters (paginated)"""
         if request.user.is_anonymous:
             return Response({"message": "You need to log in to do that"}, HTTP_403_FORBIDDEN)
 
+        fields, expand = self.get_fieldset()
+        queryset = self.get_queryset()
+        queryset = queryset.filter(player=request.user).order_by("id")
+        # Slice in the database first so only the requested page has its inventory loaded
+        page = load_character_inventories(
+            self.paginate_queryset(queryset), [CHARACTER_INVENTORIES[name] for name in expand]
+        )
+        serialiser = CharacterDetailsSerialiser(
+            page, many=True, fields=self.get_serialiser_fields(fields, expand), context={"user": request.user}
+        )
+        return self.get_paginated_response(serialiser.data)
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """List a lightweight summary of the user's characters (paginated)"""
+        if request.user.is_anonymous:
+            return Response({"message": "You need to log in to do that"}, HTTP_403_FORBIDDEN)
+
         queryset = self.get_queryset()
-        queryset = queryset.filter(player=request.user)
-        serialiser = CharacterDetailsSerialiser(queryset, many=True, context={"user": request.user})
-        return self.get_paginated_response(self.paginate_queryset(serialiser.data))
+        queryset = queryset.filter(player=request.user).order_by("id")
+        queryset = queryset.only(*CharacterSummarySerialiser.Meta.fields)
+        serialiser = CharacterSummarySerialiser(self.paginate_queryset(queryset), many=True)
+        return self.get_paginated_response(serialiser.data)
 
     def partial_update(self, request, *args, **kwargs):
         """Allow a user to update their characters"""
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework.status import *
 from rest_framework import viewsets
 from rest_framework.response import Response
@@ -71,13 +72,14 @@ class MagicItemViewSet(viewsets.GenericViewSet):
 
         serialiser = MagicItemSerialiser(data=request.data)
         if serialiser.is_valid():
-            try:
-                item_source = self.get_item_source(request, character)
-            except Exception as e:
-                return Response({"message": "Error with item origin event"}, HTTP_400_BAD_REQUEST)
-            item = serialiser.save(character=character)
-            item.source = item_source
-            item.save()
+            with transaction.atomic():
+                try:
+                    item_source = self.get_item_source(request, character)
+                except Exception as e:
+                    return Response({"message": "Error with item origin event"}, HTTP_400_BAD_REQUEST)
+                item = serialiser.save(character=character)
+                item.source = item_source
+                item.save()
 
             new_item = MagicItemSerialiser(item)
             return Response(new_item.data, HTTP_201_CREATED)
@@ -129,5 +131,6 @@ class MagicItemViewSet(viewsets.GenericViewSet):
         item = self.get_object()
         if item.character.player != request.user:
             return Response({"message": "This item does not belong to you"}, HTTP_403_FORBIDDEN)
-        item.delete()
+        with transaction.atomic():
+            item.delete()
         return Response({"message": "Item destroyed"}, HTTP_200_OK)
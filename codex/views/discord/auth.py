@@ -1,7 +1,7 @@
 from rest_framework import permissions
 from rest_framework.status import *
 
-from codex.models.api_keys import APIKey
+from codex.utils.api_keys import is_valid_api_key
 
 
 class DiscordAPIPermissions(permissions.BasePermission):
@@ -11,9 +11,6 @@ class DiscordAPIPermissions(permissions.BasePermission):
         try:
             key = request.data.get("apikey")
             assert key is not None
-            if APIKey.objects.filter(value=key).exists():
-                return True
-            else:
-                return False
+            return is_valid_api_key(key)
         except Exception as e:
             return False
@@ -1,10 +1,14 @@
+from django.db.models.functions import Upper
 from rest_framework.views import APIView, Response
 from rest_framework.status import *
 
 from codex.models.character import Character
 
 from codex.views.discord.auth import DiscordAPIPermissions
-from codex.serialisers.characters import CharacterDetailsSerialiser
+from codex.serialisers.characters import CharacterDetailsSerialiser, CharacterSummarySerialiser
+from codex.utils.character import load_character_inventories
+
+MAX_DISCORD_IDS = 50
 
 
 class DiscordCharactersLookupView(APIView):
@@ -12,11 +16,52 @@ class DiscordCharactersLookupView(APIView):
 
     permission_classes = [DiscordAPIPermissions]
 
+    def get_discord_ids(self, data):
+        """The list of discord IDs given as discord_ids, from either a JSON list or repeated form fields"""
+        if hasattr(data, "getlist"):
+            discord_ids = data.getlist("discord_ids")
+        else:
+            discord_ids = data.get("discord_ids")
+        if not isinstance(discord_ids, list) or not all(isinstance(d, str) for d in discord_ids):
+            raise ValueError("discord_ids should be a list of discord IDs")
+        if len(discord_ids) > MAX_DISCORD_IDS:
+            raise ValueError(f"No more than {MAX_DISCORD_IDS} discord IDs can be looked up at once")
+        return discord_ids
+
+    def get_characters(self, discord_ids, summary):
+        """Public characters for all of the discord IDs in one query, matched case insensitively"""
+        queryset = Character.objects.annotate(discord_id_upper=Upper("player__discord_id"))
+        queryset = queryset.filter(discord_id_upper__in={d.upper() for d in discord_ids}, public=True)
+        queryset = queryset.order_by("id")
+        if summary:
+            return list(queryset.only(*CharacterSummarySerialiser.Meta.fields))
+        return load_character_inventories(queryset)
+
+    def serialise(self, characters, summary):
+        if summary:
+            return CharacterSummarySerialiser(characters, many=True).data
+        return CharacterDetailsSerialiser(characters, many=True).data
+
     def post(self, request):
-        """request to be sent as a post containing APIKey and Discord ID"""
-        discord_id = request.data.get("discord_id")
-        queryset = Character.objects.filter(player__discord_id__iexact=discord_id)
-        queryset = queryset.filter(public=True)
+        """request to be sent as a post containing APIKey and either a Discord ID or a list of them as discord_ids
+
+        A single discord_id returns a list of characters, discord_ids returns a mapping of each ID given to its
+        characters. If summary is set the characters are returned without their inventories
+        """
+        summary = str(request.data.get("summary", "")).lower() in ["1", "true", "yes"]
+
+        if "discord_ids" not in request.data:
+            discord_id = request.data.get("discord_id")
+            characters = self.get_characters([discord_id] if discord_id else [], summary)
+            return Response(self.serialise(characters, summary), HTTP_200_OK)
+
+        try:
+            discord_ids = self.get_discord_ids(request.data)
+        except ValueError as ve:
+            return Response({"message": str(ve)}, HTTP_400_BAD_REQUEST)
 
-        serialiser = CharacterDetailsSerialiser(queryset, many=True)
-        return Response(serialiser.data, HTTP_200_OK)
+        by_discord_id = {}
+        for character in self.get_characters(discord_ids, summary):
+            by_discord_id.setdefault(character.discord_id_upper, []).append(character)
+        results = {d: self.serialise(by_discord_id.get(d.upper(), []), summary) for d in discord_ids}
+        return Response(results, HTTP_200_OK)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from rest_framework.views import APIView, Response
 from rest_framework.status import *
 
@@ -8,6 +8,7 @@ from codex.models.dungeonmaster import DungeonMasterInfo
 
 from codex.views.discord.auth import DiscordAPIPermissions
 from codex.serialisers.games import GameSerialiser
+from codex.utils.dates import filter_days
 
 
 class DiscordGamesLookupView(APIView):
@@ -39,7 +40,7 @@ class DiscordGamesCreateView(APIView):
         except Exception as e:
             return Response({"message": "Could not find a matching MSC user"}, HTTP_400_BAD_REQUEST)
 
-        game_date = datetime.fromtimestamp(float(request.data.get("datetime")))
+        game_date = datetime.fromtimestamp(float(request.data.get("datetime")), tz=timezone.utc)
         game_data = {
             "datetime": game_date,
             "name": request.data.get("name", ""),
@@ -56,9 +57,9 @@ class DiscordGamesCreateView(APIView):
         game_data["owner"] = owner
         game_data["dm"] = dm
 
-        existing_game = (
-            Game.objects.filter(module=game_data["module"]).filter(dm=dm).filter(datetime__date=game_date).first()
-        )
+        existing_game = filter_days(
+            Game.objects.filter(dm=dm, module=game_data["module"]), "datetime", game_date
+        ).first()
         if existing_game:
             return Response(
                 {"message": f"A game matching this already exists with UUID: {existing_game.uuid}"},
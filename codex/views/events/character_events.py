@@ -1,38 +1,110 @@
-from rest_framework.pagination import LimitOffsetPagination
+from datetime import datetime, time
+
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.settings import api_settings
 from rest_framework.status import *
+from rest_framework.utils.urls import replace_query_param
 
-from codex.models.events import DMReward
+from codex.models.events import Game, DMReward, RemovedEvent
 from codex.models.character import Character
 from codex.models.events_downtime import SpellbookUpdate, FreeForm
 from codex.serialisers.games import GameSerialiser
 from codex.serialisers.dm_rewards import DMRewardSerialiser
+from codex.serialisers.events import RemovedEventSerialiser
 from codex.serialisers.events_downtime import SpellbookUpdateSerialiser, FreeFormSerialiser
+from codex.utils.timeline import get_character_timeline, encode_timeline_cursor, decode_timeline_cursor
+from codex.utils.timeline import TIMELINE_ORDERS
+
+
+class CharacterEventView(APIView):
+    """Combines all character event types into a single list of objects, paginated by cursor"""
 
+    max_limit = 500
+    event_types = {
+        "game": (
+            Game.objects.select_related("owner", "dm__player").prefetch_related(
+                "characters", "magicitems", "consumables"
+            ),
+            GameSerialiser,
+        ),
+        "dm_reward": (
+            DMReward.objects.select_related("dm__player", "character_level_assigned", "character_items_assigned"),
+            DMRewardSerialiser,
+        ),
+        "dt_sbookupd": (SpellbookUpdate.objects.select_related("character__player"), SpellbookUpdateSerialiser),
+        "dt_freeform": (FreeForm.objects.select_related("character__player"), FreeFormSerialiser),
+        "removed": (RemovedEvent.objects.all(), RemovedEventSerialiser),
+    }
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params.get("limit", api_settings.PAGE_SIZE))
+        except ValueError:
+            limit = api_settings.PAGE_SIZE
+        return max(1, min(limit, self.max_limit))
 
-class CharacterEventView(APIView, LimitOffsetPagination):
-    """Combines all character event types into a single list of objects"""
+    def serialise_events(self, keys, request) -> list:
+        """Load and serialise only the events on the page, with one query per event type"""
+        ids = {}
+        for _datetime, event_type, pk in keys:
+            ids.setdefault(event_type, []).append(pk)
+
+        serialised = {}
+        for event_type, pks in ids.items():
+            (queryset, serialiser) = self.event_types[event_type]
+            events = list(queryset.filter(pk__in=pks))
+            for event, data in zip(events, serialiser(events, many=True, context={"user": request.user}).data):
+                serialised[(event_type, event.pk)] = data
+        return [serialised[(event_type, pk)] for _datetime, event_type, pk in keys]
+
+    def get_datetime(self, request, name: str):
+        """Read an optional datetime query parameter, raising ValueError if it can't be understood"""
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        parsed = parse_datetime(value) or parse_date(value)
+        if parsed is None:
+            raise ValueError(f"Invalid {name} date")
+        if not isinstance(parsed, datetime):
+            parsed = datetime.combine(parsed, time.min)
+        return make_aware(parsed) if is_naive(parsed) else parsed
 
     def get(self, request, character_uuid=None):
-        """List all character events for the character passed by uuid"""
+        """List character events for the character passed by uuid
+
+        Events are in date order unless order=updated is given, in which case they are in the order they were last
+        changed. The cursor returned with each page can be passed back later to fetch only what has changed since.
+        Changes include events that were deleted or that the character left, as entries with an event_type of removed
+        and the uuid and removed_event_type of the event to drop
+        """
         try:
             character = Character.objects.get(uuid=character_uuid)
         except Character.DoesNotExist:
             return Response({"message": "Specified character could not be found"}, status=HTTP_404_NOT_FOUND)
 
-        games = character.games.all()
-        games.prefetch_related("magicitems", "consumables")
-        rewards = DMReward.objects.filter(character_items_assigned=character)
-        freeform = FreeForm.objects.filter(character=character)
-        spellbookupdate = SpellbookUpdate.objects.filter(character=character)
+        try:
+            cursor = request.query_params.get("cursor")
+            (order, after) = decode_timeline_cursor(cursor) if cursor else (request.query_params.get("order"), None)
+            since = self.get_datetime(request, "since")
+            until = self.get_datetime(request, "until")
+        except ValueError as ve:
+            return Response({"message": str(ve)}, status=HTTP_400_BAD_REQUEST)
+        if order not in TIMELINE_ORDERS:
+            order = "datetime"
 
-        games_serialiser = GameSerialiser(games, many=True, context={"user": request.user})
-        rewards_serialiser = DMRewardSerialiser(rewards, many=True, context={"user": request.user})
-        spellupdate_serialiser = SpellbookUpdateSerialiser(spellbookupdate, many=True, context={"user": request.user})
-        freeform_serialiser = FreeFormSerialiser(freeform, many=True, context={"user": request.user})
+        limit = self.get_limit(request)
+        keys = get_character_timeline(character, order=order, after=after, since=since, until=until, limit=limit + 1)
+        next_link = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_link = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_timeline_cursor(order, keys[-1])
+            )
+        if keys:
+            cursor = encode_timeline_cursor(order, keys[-1])
 
-        data = games_serialiser.data + rewards_serialiser.data
-        data = data + spellupdate_serialiser.data
-        data = data + freeform_serialiser.data
+        data = {"next": next_link, "cursor": cursor, "results": self.serialise_events(keys, request)}
         return Response(data, HTTP_200_OK)
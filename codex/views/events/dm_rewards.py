@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.forms import ValidationError
 from rest_framework import viewsets
 from rest_framework.status import *
@@ -10,6 +11,7 @@ from codex.models.dungeonmaster import DungeonMasterInfo
 from codex.models.items import MagicItem
 from codex.serialisers.dm_rewards import DMRewardSerialiser
 from codex.utils.dm_info import update_dm_hours
+from codex.utils.character import update_character_rewards
 from codex.utils.items import get_matching_item
 
 
@@ -31,17 +33,16 @@ class DMRewardViewSet(viewsets.GenericViewSet):
         return item
 
     def assign_other_rewards(self, character, gold, downtime):
-        """Assign misc rewards to character specified"""
+        """Assign misc rewards to character specified, raising ValueError if they can't be applied"""
         if not character:
-            return None
+            return
 
-        if gold:
-            character.gold = character.gold + int(gold)
-        if downtime:
-            character.downtime = character.downtime + int(downtime)
-        if gold or downtime:
-            character.save()
-        return True
+        try:
+            gold = int(gold or 0)
+            downtime = int(downtime or 0)
+        except (TypeError, ValueError):
+            raise ValueError("Gold and downtime must be whole numbers")
+        update_character_rewards(character, gold=gold, downtime=downtime)
 
     def get_queryset(self):
         """Retrieve base queryset"""
@@ -72,13 +73,18 @@ class DMRewardViewSet(viewsets.GenericViewSet):
 
         serialiser = DMRewardSerialiser(data=request.data)
         if serialiser.is_valid():
-            reward = serialiser.save(
-                dm=dm, character_level_assigned=character_levels, character_items_assigned=character_items
-            )
-            item = self.create_dm_reward_item(reward, character_items, item, rarity)
-            misc_rewards_done = self.assign_other_rewards(character_items, gold, downtime)
-            if service_hours:
-                update_dm_hours(dm, -int(service_hours))
+            # The reward, its item and the character's gold and downtime are all kept or all discarded
+            try:
+                with transaction.atomic():
+                    reward = serialiser.save(
+                        dm=dm, character_level_assigned=character_levels, character_items_assigned=character_items
+                    )
+                    self.create_dm_reward_item(reward, character_items, item, rarity)
+                    self.assign_other_rewards(character_items, gold, downtime)
+                    if service_hours:
+                        update_dm_hours(dm, -int(service_hours))
+            except ValueError as ve:
+                return Response({"message": str(ve)}, HTTP_400_BAD_REQUEST)
             new_reward = DMRewardSerialiser(reward, context={"user": request.user})
             return Response(new_reward.data, HTTP_201_CREATED)
         else:
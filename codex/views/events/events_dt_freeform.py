@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import viewsets
@@ -6,6 +7,7 @@ from codex.models.character import Character
 
 from codex.models.events_downtime import FreeForm
 from codex.serialisers.events_downtime import FreeFormSerialiser
+from codex.utils.character import update_character_rewards
 
 
 class EventDowntimeFreeFormView(viewsets.GenericViewSet):
@@ -44,26 +46,17 @@ class EventDowntimeFreeFormView(viewsets.GenericViewSet):
             return Response({"message": "No character specified"}, HTTP_400_BAD_REQUEST)
         auto_apply = request.data.get("auto_apply")
 
-        if auto_apply:
-            gold_change = float(request.data.get("gold_change"))
-            if gold_change < 0 and char.gold < abs(gold_change):
-                return Response(
-                    {"message": f"Insufficient gold, this character has {char.gold} gp"}, HTTP_400_BAD_REQUEST
-                )
-            char.gold = char.gold + gold_change
-            downtime_change = float(request.data.get("downtime_change"))
-            if downtime_change < 0 and char.downtime < abs(downtime_change):
-                return Response(
-                    {"message": f"Insufficient downtime, this character has {char.downtime} days"},
-                    HTTP_400_BAD_REQUEST,
-                )
-            char.downtime = char.downtime + downtime_change
-
         serialiser = FreeFormSerialiser(data=request.data, context={"user": request.user})
         if serialiser.is_valid():
-            event = serialiser.save(character=char)
-            if auto_apply:
-                char.save()
+            try:
+                with transaction.atomic():
+                    event = serialiser.save(character=char)
+                    if auto_apply:
+                        gold_change = float(request.data.get("gold_change") or 0)
+                        downtime_change = float(request.data.get("downtime_change") or 0)
+                        update_character_rewards(char, gold=gold_change, downtime=downtime_change)
+            except ValueError as ve:
+                return Response({"message": str(ve)}, HTTP_400_BAD_REQUEST)
             return Response(serialiser.data, HTTP_201_CREATED)
         else:
             return Response({"message": "Invalid request data"}, HTTP_400_BAD_REQUEST)
@@ -97,7 +90,8 @@ class EventDowntimeFreeFormView(viewsets.GenericViewSet):
             event = self.get_object()
             if event.character.player != request.user:
                 raise PermissionError
-            event.delete()
+            with transaction.atomic():
+                event.delete()
             return Response({"message": "Event deleted"}, HTTP_200_OK)
 
         except FreeForm.DoesNotExist as e:
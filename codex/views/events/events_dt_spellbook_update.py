@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import viewsets
@@ -6,6 +7,7 @@ from codex.models.character import Character
 
 from codex.models.events_downtime import SpellbookUpdate
 from codex.serialisers.events_downtime import SpellbookUpdateSerialiser
+from codex.utils.character import update_character_rewards
 
 
 class EventDowntimeSpellbookUpdateView(viewsets.GenericViewSet):
@@ -45,17 +47,15 @@ class EventDowntimeSpellbookUpdateView(viewsets.GenericViewSet):
 
         gold_change = float(request.data.get("gold") or 0.0)
         downtime_change = float(request.data.get("downtime") or 0.0)
-        if downtime_change > char.downtime:
-            return Response({"message": "Insufficient downtime to perform this activity"}, HTTP_400_BAD_REQUEST)
-        if gold_change > char.gold:
-            return Response({"message": "Insufficient gold to perform this activity"}, HTTP_400_BAD_REQUEST)
         serialiser = SpellbookUpdateSerialiser(data=request.data, context={"user": request.user})
         if serialiser.is_valid():
-            event = serialiser.save(character=char)
-            # Subtract the gold and downtime from the character
-            char.gold = char.gold - float(gold_change)
-            char.downtime = char.downtime - float(downtime_change)
-            char.save()
+            try:
+                with transaction.atomic():
+                    event = serialiser.save(character=char)
+                    # Subtract the gold and downtime from the character
+                    update_character_rewards(char, gold=-gold_change, downtime=-downtime_change)
+            except ValueError as ve:
+                return Response({"message": str(ve)}, HTTP_400_BAD_REQUEST)
             return Response(serialiser.data, HTTP_201_CREATED)
         else:
             return Response({"message": "Invalid request data"}, HTTP_400_BAD_REQUEST)
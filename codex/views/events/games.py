@@ -1,3 +1,6 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from rest_framework import viewsets
 from rest_framework.status import *
 from rest_framework.decorators import action
@@ -11,7 +14,7 @@ from codex.models.dungeonmaster import DungeonMasterInfo
 
 from codex.serialisers.games import GameSerialiser
 from codex.utils.character import update_character_rewards, add_reference_items_to_character
-from codex.utils.character import update_items_from_reference
+from codex.utils.character import update_items_from_reference, get_reference_items_state
 
 from codex.utils.items import get_matching_item
 from codex.utils.dm_info import update_dm_hours
@@ -55,10 +58,40 @@ class GamesViewSet(viewsets.GenericViewSet):
         """Retrieve base queryset"""
         return Game.objects.all()
 
+    def get_request_characters(self, data):
+        """The characters named by a list of character_uuids, or a single character_uuid, in one query
+
+        Raises Character.DoesNotExist if none are given or any of them can't be found
+        """
+        if hasattr(data, "getlist") and "character_uuids" in data:
+            character_uuids = data.getlist("character_uuids")
+        else:
+            character_uuids = data.get("character_uuids")
+        if character_uuids is None:
+            character_uuids = [data.get("character_uuid")]
+        if not isinstance(character_uuids, list) or not character_uuids or not all(character_uuids):
+            raise Character.DoesNotExist()
+
+        character_uuids = list(dict.fromkeys(str(uuid).lower() for uuid in character_uuids))
+        try:
+            characters = list(Character.objects.filter(uuid__in=character_uuids).order_by("id"))
+        except ValidationError as e:
+            raise Character.DoesNotExist() from e
+        if len(characters) != len(character_uuids):
+            raise Character.DoesNotExist()
+        return characters
+
+    def add_characters_to_game(self, game, characters, gold, downtime):
+        """Add characters to a game, giving each of them its rewards and copies of its reference items"""
+        game.characters.add(*characters)
+        for character in characters:
+            update_character_rewards(character, gold=gold, downtime=downtime)
+        add_reference_items_to_character(characters, game)
+
     def create(self, request):
-        """Create a new game and place the current character into it"""
+        """Create a new game and place the current character, or a list of characters, into it"""
         dm = None
-        character = None
+        characters = []
 
         # Get the game's DM if availabe
         dm_name = request.data.get("dm_name")
@@ -70,25 +103,26 @@ class GamesViewSet(viewsets.GenericViewSet):
         # DM is not set at creation time, so this game is being created by a player
         else:
             try:
-                character_uuid = request.data.get("character_uuid")
-                character = Character.objects.get(uuid=character_uuid)
-            except (KeyError, Character.DoesNotExist):
+                characters = self.get_request_characters(request.data)
+            except Character.DoesNotExist:
                 return Response({"message": "Character UUID not set or invalid"}, HTTP_400_BAD_REQUEST)
 
-            if character.player != request.user:
+            if any(character.player != request.user for character in characters):
                 return Response({"message": "This character does not belong to you"}, HTTP_403_FORBIDDEN)
 
         serialiser = GameSerialiser(data=request.data)
         if serialiser.is_valid():
-            game = serialiser.save(owner=request.user, dm=dm)
-
-            # if added by a player, update player specific things
-            if character:
-                game.characters.add(character)
-                awarded_gold = float(request.data.get("gold") or 0)
-                awarded_downtime = int(request.data.get("downtime") or 0)
-                update_character_rewards(character, gold=awarded_gold, downtime=awarded_downtime)
-                add_reference_items_to_character(character, game)
+            try:
+                with transaction.atomic():
+                    game = serialiser.save(owner=request.user, dm=dm)
+
+                    # if added by a player, update player specific things
+                    if characters:
+                        awarded_gold = float(request.data.get("gold") or 0)
+                        awarded_downtime = int(request.data.get("downtime") or 0)
+                        self.add_characters_to_game(game, characters, awarded_gold, awarded_downtime)
+            except ValueError as ve:
+                return Response({"message": str(ve)}, HTTP_400_BAD_REQUEST)
             return Response(serialiser.data, HTTP_201_CREATED)
         else:
             errors = serialiser.errors
@@ -113,14 +147,16 @@ class GamesViewSet(viewsets.GenericViewSet):
         else:
             if not request.user.is_authenticated:
                 return Response({"message": "Character UUID not set or invalid"}, HTTP_400_BAD_REQUEST)
-            played = Game.objects.filter(characters__player=request.user)
-            dmed = Game.objects.filter(dm__player=request.user)
-            queryset = played | dmed
+            # EXISTS rather than a join so games with several of the user's characters are only listed once
+            played = Game.characters.through.objects.filter(game=OuterRef("pk"), character__player=request.user)
+            queryset = Game.objects.filter(Exists(played) | Q(dm__player=request.user))
 
-        queryset = queryset.order_by("datetime")
+        queryset = queryset.order_by("datetime", "pk")
+        queryset = queryset.select_related("owner", "dm__player")
         queryset = queryset.prefetch_related("characters", "magicitems", "consumables")
-        serialiser = GameSerialiser(queryset, many=True, context={"user": request.user})
-        return Response(serialiser.data)
+        page = self.paginate_queryset(queryset)
+        serialiser = GameSerialiser(page, many=True, context={"user": request.user})
+        return self.get_paginated_response(serialiser.data)
 
     def partial_update(self, request, *args, **kwargs):
         """Allow a the owner to modify the game"""
@@ -131,14 +167,12 @@ class GamesViewSet(viewsets.GenericViewSet):
 
         serialiser = GameSerialiser(game, data=request.data, partial=True)
         if serialiser.is_valid():
-            new_game = serialiser.save()
-            try:
-                # Attempt to update the characters in the game with the new items
-                update_chars = new_game.characters.all()
-                for update_char in update_chars:
-                    update_items_from_reference(update_char, game)
-            except Character.DoesNotExist:
-                pass
+            with transaction.atomic():
+                reference_items = get_reference_items_state(game)
+                new_game = serialiser.save()
+                # Update the characters in the game with the new items, if there are any
+                if get_reference_items_state(new_game) != reference_items:
+                    update_items_from_reference(new_game.characters.all(), new_game, reference_items)
             return Response(serialiser.data, HTTP_200_OK)
         else:
             return Response({"message": "Invalid data in update request"}, HTTP_400_BAD_REQUEST)
@@ -163,24 +197,27 @@ class GamesViewSet(viewsets.GenericViewSet):
             return Response({"message": "Character could not be found"}, HTTP_400_BAD_REQUEST)
 
         game = self.get_object()
-        game.characters.remove(character)
+        with transaction.atomic():
+            game.characters.remove(character)
         return Response({"message": "Character removed"}, HTTP_200_OK)
 
     @action(detail=True, methods=["post"])
     def add_character(self, request, *args, **kwargs):
+        """Add a character, or a list of characters, to an existing game"""
         try:
-            character_uuid = request.data["character_uuid"]
-            character = Character.objects.get(uuid=character_uuid)
-            if character.player != request.user:
-                return Response({"message": "This character does not belong to you"}, HTTP_403_FORBIDDEN)
-        except (KeyError, Character.DoesNotExist) as e:
-            character = None
+            characters = self.get_request_characters(request.data)
+        except Character.DoesNotExist:
             return Response({"message": "Character could not be found"}, HTTP_400_BAD_REQUEST)
+        if any(character.player != request.user for character in characters):
+            return Response({"message": "This character does not belong to you"}, HTTP_403_FORBIDDEN)
 
         game = self.get_object()
-        if character in game.characters.all():
-            return Response({"message": f"Character '{character.name}' already in this game"}, HTTP_400_BAD_REQUEST)
-        game.characters.add(character)
-        update_character_rewards(character, gold=game.gold, downtime=game.downtime)
-        add_reference_items_to_character(character, game)
+        existing = game.characters.filter(pk__in=[character.pk for character in characters]).first()
+        if existing:
+            return Response({"message": f"Character '{existing.name}' already in this game"}, HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                self.add_characters_to_game(game, characters, game.gold, game.downtime)
+        except ValueError as ve:
+            return Response({"message": str(ve)}, HTTP_400_BAD_REQUEST)
         return Response({"message": "Added character to an existing game"}, HTTP_200_OK)
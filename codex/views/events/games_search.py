@@ -1,22 +1,84 @@
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Upper
+from django.utils.dateparse import parse_date
 from rest_framework.status import *
-from rest_framework.views import APIView, Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from codex.serialisers.games import GameSerialiser
 from codex.models.events import Game
+from codex.utils.dates import filter_days
 
+SEARCH_FIELDS = ["module", "name", "dm_name", "location"]
 
-class SearchGamesView(APIView):
+
+def prefix_filter(field, prefix):
+    """Match the start of an upper cased field in a way the database can answer from an index
+
+    Postgres has pattern_ops indexes that serve LIKE 'prefix%' directly, elsewhere the prefix is written as a range
+    over the functional UPPER() index
+    """
+    if connection.vendor == "postgresql":
+        return Q(**{f"{field}_upper__startswith": prefix})
+    return Q(**{f"{field}_upper__gte": prefix, f"{field}_upper__lt": prefix + "\uffff"})
+
+
+class SearchGamesView(GenericAPIView):
+    serializer_class = GameSerialiser
     permission_classes = [IsAuthenticated]
 
+    def get_dates(self, data):
+        """The dates to search between, either a single day or an inclusive start and end date"""
+        if data.get("datetime"):
+            day = parse_date(data["datetime"][0:10])
+            return day, day
+        return parse_date(data.get("start") or ""), parse_date(data.get("end") or "")
+
+    def search(self, module, text, start, end):
+        """Games in the date range matching a module code prefix and / or a prefix of any of the search fields"""
+        games = Game.objects.alias(**{f"{field}_upper": Upper(field) for field in SEARCH_FIELDS})
+        games = filter_days(games, "datetime", start, end)
+
+        # Exact module codes rank above prefixes, then matches on the module name above the DM and location
+        ranks = []
+        if module:
+            module = module.strip().upper()
+            games = games.filter(prefix_filter("module", module))
+            ranks.append(When(module_upper=module, then=Value(0)))
+        if text:
+            text = text.strip().upper()
+            matches = Q()
+            for field in SEARCH_FIELDS:
+                matches |= prefix_filter(field, text)
+            games = games.filter(matches)
+            ranks += [
+                When(module_upper=text, then=Value(0)),
+                When(module_upper__startswith=text, then=Value(1)),
+                When(name_upper__startswith=text, then=Value(2)),
+            ]
+
+        games = games.alias(rank=Case(*ranks, default=Value(3), output_field=IntegerField()))
+        games = games.select_related("owner", "dm__player")
+        games = games.prefetch_related("characters", "magicitems", "consumables")
+        return games.order_by("rank", "datetime", "pk")
+
     def post(self, request):
         """Search across all games"""
         module = request.data.get("module")
-        datetime = request.data.get("datetime")
+        text = request.data.get("search")
 
         try:
-            games = Game.objects.filter(module__iexact=module).filter(datetime__date=datetime[0:10])
-            serialised = GameSerialiser(games, many=True, context={"user": request.user})
-            return Response(serialised.data)
-        except Exception as e:
-            return Response({"message": "Error in search"}, HTTP_400_BAD_REQUEST)
+            start, end = self.get_dates(request.data)
+        except (TypeError, ValueError):
+            return Response({"message": "Invalid date"}, HTTP_400_BAD_REQUEST)
+        if not (module or text) or not (start and end) or end < start:
+            return Response(
+                {"message": "A module or search text and a date or date range are required"}, HTTP_400_BAD_REQUEST
+            )
+
+        games = self.search(module, text, start, end)
+        page = self.paginate_queryset(games)
+        serialised = GameSerialiser(page, many=True, context={"user": request.user})
+        return self.get_paginated_response(serialised.data)
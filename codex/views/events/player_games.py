@@ -1,8 +1,12 @@
+from collections import defaultdict
+
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
 from rest_framework.status import *
-from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework.permissions import IsAuthenticated
 
+from codex.models.events import Game
 from codex.serialisers.games import GameSerialiser
 from codex.serialisers.characters import CharacterSerialiser
 
@@ -13,14 +17,34 @@ class PlayerGamesViewSet(viewsets.GenericViewSet):
     serializer_class = GameSerialiser
     permission_classes = [IsAuthenticated]
 
-    def list(self, request):
-        """list all games for a given user"""
-        all_games = []
-        characters = request.user.characters.all()
+    def get_games_by_character(self, user):
+        """Fetch every game played by the user's characters in a single pass over the character/game links"""
+        links = Game.characters.through.objects.filter(character__player=user)
+        links = links.select_related("game__owner", "game__dm__player")
+        links = links.prefetch_related("game__characters", "game__magicitems", "game__consumables")
+        links = links.order_by("character_id", "game__datetime", "game_id")
+
+        games = defaultdict(list)
+        for link in links:
+            games[link.character_id].append(link.game)
+        return games
 
-        for character in characters:
+    def stream_games(self, characters, games, context):
+        """Serialise one character at a time so the start of the list can be sent before the end is built"""
+        renderer = JSONRenderer()
+        yield b"["
+        for i, character in enumerate(characters):
+            if i:
+                yield b","
             serialised_character = CharacterSerialiser(character)
-            serialised_games = GameSerialiser(character.games.all(), many=True)
-            all_games.append({"character": serialised_character.data, "games": serialised_games.data})
+            serialised_games = GameSerialiser(games.get(character.pk, []), many=True, context=context)
+            yield renderer.render({"character": serialised_character.data, "games": serialised_games.data})
+        yield b"]"
+
+    def list(self, request):
+        """list all games for a given user"""
+        characters = list(request.user.characters.all())
+        games = self.get_games_by_character(request.user) if characters else {}
 
-        return Response(all_games)
+        content = self.stream_games(characters, games, {"user": request.user})
+        return StreamingHttpResponse(content, status=HTTP_200_OK, content_type="application/json")
@@ -1,3 +1,5 @@
+import io
+
 from rest_framework.views import APIView
 from rest_framework.status import *
 from rest_framework.response import Response
@@ -5,6 +7,7 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from codex.serialisers.characters import CharacterDetailsSerialiser
 from codex.imports.csv import parse_csv_import
+from codex.imports.uploads import get_export_files, ExportFileError
 
 
 class CharacterImportView(APIView):
@@ -12,10 +15,34 @@ class CharacterImportView(APIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def import_files(self, request):
+        """Import every uploaded export, each character is created in its own transaction"""
+        characters = []
+        errors = []
+
+        try:
+            for name, export in get_export_files(request.FILES.getlist("files")):
+                try:
+                    characters.append(parse_csv_import(export, request.user))
+                except Exception as e:
+                    errors.append({"file": name, "message": f"Character import failed {str(e)}"})
+        except ExportFileError as e:
+            # Uploads are checked before anything is imported, so this is only reached part way for a damaged archive
+            errors.append({"file": e.filename, "message": f"Character import failed {str(e)}"})
+
+        serialised = CharacterDetailsSerialiser(characters, many=True, context={"user": request.user})
+        data = {"characters": serialised.data, "errors": errors}
+        if not characters:
+            return Response(data, HTTP_400_BAD_REQUEST)
+        return Response(data, HTTP_201_CREATED)
+
     def put(self, request):
-        """import a CSV file full of character details"""
+        """import a CSV file full of character details, or a batch of them uploaded as files or zip archives"""
+        if request.FILES:
+            return self.import_files(request)
+
         csv_contents = request.data.get("importData")
-        lines = csv_contents.splitlines()
+        lines = io.StringIO(csv_contents)
 
         try:
             character = parse_csv_import(lines, request.user)
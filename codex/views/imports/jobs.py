@@ -0,0 +1,61 @@
+import zipfile
+
+from rest_framework import viewsets
+from rest_framework.status import *
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from codex.models.imports import ImportJob
+from codex.serialisers.imports import ImportJobSerialiser
+from codex.imports.uploads import get_export_files, ExportFileError
+
+
+class ImportJobViewSet(viewsets.GenericViewSet):
+    """Queue character imports for the import worker and report on their progress"""
+
+    serializer_class = ImportJobSerialiser
+    permission_classes = [IsAuthenticated]
+    lookup_field = "uuid"
+
+    def get_queryset(self):
+        """Only the requesting user's jobs, without their export contents"""
+        return (
+            ImportJob.objects.filter(user=self.request.user)
+            .defer("data")
+            .select_related("character")
+            .order_by("-created", "-pk")
+        )
+
+    def list(self, request):
+        """List the user's import jobs, most recent first"""
+        page = self.paginate_queryset(self.get_queryset())
+        serialiser = ImportJobSerialiser(page, many=True)
+        return self.get_paginated_response(serialiser.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Get the status of a single import job"""
+        job = self.get_object()
+        return Response(ImportJobSerialiser(job).data)
+
+    def create(self, request):
+        """Queue an export sent as a string, or one job per uploaded file or CSV file within a zip archive"""
+        jobs = []
+        if request.FILES:
+            try:
+                for name, export in get_export_files(request.FILES.getlist("files")):
+                    jobs.append(ImportJob(user=request.user, filename=name, data=export.read()))
+            except ExportFileError as e:
+                return Response({"message": str(e)}, HTTP_400_BAD_REQUEST)
+            except (zipfile.BadZipFile, UnicodeDecodeError):
+                return Response(
+                    {"message": "Uploads must be UTF-8 CSV exports or zip archives of them"}, HTTP_400_BAD_REQUEST
+                )
+        elif request.data.get("importData"):
+            jobs.append(ImportJob(user=request.user, data=request.data.get("importData")))
+
+        if not jobs:
+            return Response({"message": "No export data provided"}, HTTP_400_BAD_REQUEST)
+
+        jobs = ImportJob.objects.bulk_create(jobs)
+        serialiser = ImportJobSerialiser(jobs, many=True)
+        return Response(serialiser.data, HTTP_202_ACCEPTED)
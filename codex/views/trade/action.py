@@ -1,9 +1,11 @@
+from django.db import transaction
 from rest_framework.views import APIView, Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.status import *
 
 from codex.models.events import Trade
 from codex.models.trade import Advert, Offer
+from codex.utils.character import update_character_counters, update_character_rewards
 
 
 class TradeActionView(APIView):
@@ -21,16 +23,14 @@ class TradeActionView(APIView):
         item1 = offer.item
         item2 = offer.advert.item
 
-        # subtract character downtime
-        item1.character.downtime -= 5
-        item2.character.downtime -= 5
+        # subtract character downtime, raises ValueError if either can no longer afford it
+        update_character_rewards(item1.character, downtime=-5)
+        update_character_rewards(item2.character, downtime=-5)
         # swap the item owners
         [item1.character, item2.character] = [item2.character, item1.character]
         # save everything to database
         item1.save()
         item2.save()
-        item1.character.save()
-        item2.character.save()
         # create trade events
         trade1 = Trade.objects.create(sender=item1.character, recipient=item2.character, item=item1, associated=None)
         trade2 = Trade.objects.create(sender=item2.character, recipient=item1.character, item=item2, associated=None)
@@ -38,6 +38,8 @@ class TradeActionView(APIView):
         trade2.associated=trade1
         trade1.save()
         trade2.save()
+        # Items changed hands, so recount both inventories
+        update_character_counters(item1.character_id, item2.character_id)
 
         return (item1, item2)
 
@@ -60,9 +62,13 @@ class TradeActionView(APIView):
             elif offer.advert.item.character.downtime < 5:
                 return Response({'message': 'Receiving character does not have enough downtime to trade'}, HTTP_400_BAD_REQUEST)
             else:
-                (item1, item2) = self._accept_offer(offer)
-                self._clear_trade(item1)
-                self._clear_trade(item2)
+                try:
+                    with transaction.atomic():
+                        (item1, item2) = self._accept_offer(offer)
+                        self._clear_trade(item1)
+                        self._clear_trade(item2)
+                except ValueError as ve:
+                    return Response({'message': str(ve)}, HTTP_400_BAD_REQUEST)
                 return Response({'message': 'Trade completed'}, HTTP_200_OK)
         elif action == 'reject':
             self._reject_offer(offer)
@@ -32,6 +32,9 @@ DB_NAME = getenv("DB_NAME", "moonseacodex")
 # Database env vars - sqlite
 DB_PATH = Path(getenv("DB_PATH", BASE_DIR))
 
+# Cache env vars - a directory shared by every server process, memory local to each process if not set
+CACHE_PATH = getenv("CACHE_PATH", None)
+
 # EMail env vars
 EMAIL_API_KEY = getenv("EMAIL_API_KEY")
 DEFAULT_EMAIL_SENDER = getenv("DEFAULT_EMAIL_SENDER")
@@ -99,6 +102,20 @@ else:
         },
     }
 
+if CACHE_PATH:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_PATH,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 AUTH_USER_MODEL = "codex.CodexUser"
 AUTHENTICATION_BACKENDS = [
     "discord_auth.auth.DiscordAuthenticationBackend",
@@ -0,0 +1,11 @@
+#!/bin/sh
+# Start the character import worker alongside Apache, restarting it if it ever exits
+(
+    while true; do
+        runuser -u www-data -- python /moonseacodex_api/manage.py run_import_worker
+        echo "Import worker exited, restarting" >&2
+        sleep 5
+    done
+) &
+
+exec apachectl -D FOREGROUND